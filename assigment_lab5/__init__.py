@@ -0,0 +1,4 @@
+"""Lab 5: radar-based Emergency Braking System (EBS).
+
+Run from the repository root with ``python -m assigment_lab5.main``.
+"""
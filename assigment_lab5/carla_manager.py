@@ -1,28 +1,36 @@
 "Manages the connection to the CARLA server and actor cleanup"
 
-import carla
-import config
+from assigment_lab5 import config
+from utils.actor_registry import ActorRegistry
+from utils.lazy import lazy_import
+
+carla = lazy_import('carla')
 
 class CarlaManager:
     def __init__(self):
         self.client = None
         self.world = None
-        self.actor_list = []
+        self.registry = None
+        self.traffic = None  # optional utils.traffic.BackgroundTraffic, torn down on exit
 
     def __enter__(self):
-        """Connection to CARLA server and gets the world"""
+        """Connection to CARLA server, gets the world and removes actors leaked by earlier runs"""
         print("Connecting to CARLA...")
         self.client = carla.Client(config.HOST, config.PORT)
         self.client.set_timeout(config.TIMEOUT)
         self.world = self.client.get_world()
         print("Connection successfully")
+
+        self.registry = ActorRegistry(self.client, self.world)
+        self.registry.sweep_orphans()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        """Destroys all tracked actors to clean up the simulation"""
+        """Stops sensors and destroys all tracked actors in one batch to clean up the simulation"""
         print("\nCleaning up actors...")
-        for actor in self.actor_list:
-            if actor.is_alive:
-                print(f"Destroying actor {actor.type_id}")
-                actor.destroy()
+        if self.traffic is not None:
+            # Also puts back the world settings the traffic changed on the server
+            self.traffic.destroy()
+        if self.registry is not None:
+            self.registry.destroy_all()
         print("cleanup completed")
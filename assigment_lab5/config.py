@@ -13,6 +13,9 @@ TARGET_VEHICLE_MODEL = 'vehicle.volkswagen.t2'
 # Emergency Braking System (EBS) settings
 TTC_THRESHOLD = 2 #seconds
 STABLE_DETECTION_THRESHOLD = 3 #number of consecutive "true"
+LANE_HALF_WIDTH = 1.75 #meters, only radar returns inside this corridor are in-path
+IN_PATH_MIN_HEIGHT = 0.3 #meters above the ground, lower returns are the road surface
+IN_PATH_MAX_HEIGHT = 2.5 #meters above the ground, higher returns are bridges and signs
 
 #RADAR value
 RADAR_RANGE = 50.0 #meters
@@ -20,5 +23,53 @@ RADAR_HORIZONTAL_FOV = 45 #degrees
 RADAR_VERTICAL_FOV = 30 #degrees
 RADAR_POINTS_PER_SECOND = 1500
 
+#Front camera (monocular TTC from image scale change, reported next to the radar TTC)
+CAMERA_WIDTH = 800
+CAMERA_HEIGHT = 600
+CAMERA_FOV = 90 #degrees
+CAMERA_TICK = 0.05 #seconds, 20 FPS
+CAMERA_TTC_MAX_PATCH = 160 #pixels, the window around the lead vehicle is shrunk to at most this width
+CAMERA_TTC_SMOOTHING = 0.5 #EWMA weight of the newest expansion rate
+
+#Visualizer (rendered in its own process, never slows down the EBS loop)
+DISPLAY_FPS = 15
+VIDEO_OUTPUT = None #e.g. 'ebs.mp4' to record the run
+HEADLESS = False #True: no window, only the video file
+
+# Background traffic (Traffic Manager autopilot vehicles, 0 = empty road)
+BACKGROUND_TRAFFIC = 0 #number of vehicles
+TM_PORT = 8000
+HYBRID_PHYSICS_RADIUS = 70.0 #meters around the ego with full vehicle physics
+ACTOR_ACTIVE_DISTANCE = 300.0 #meters, large maps only: farther actors go dormant (CARLA default 2000)
+
+# Sensor rig mounted on the ego vehicle (see utils/rig.py for the format)
+SENSOR_RIG = {
+    'sensors': [
+        {
+            'name': 'front_radar',
+            'type': 'radar',
+            'pose': {'x': 2.5, 'z': 1.0},
+            'attributes': {
+                'horizontal_fov': RADAR_HORIZONTAL_FOV,
+                'vertical_fov': RADAR_VERTICAL_FOV,
+                'points_per_second': RADAR_POINTS_PER_SECOND,
+                'range': RADAR_RANGE,
+            },
+            'priority': 'critical',  # EBS input, never slowed down by the governor
+        },
+        {
+            'name': 'front_camera',
+            'type': 'camera',
+            'pose': {'x': 1.5, 'z': 1.4},
+            'attributes': {
+                'image_size_x': CAMERA_WIDTH,
+                'image_size_y': CAMERA_HEIGHT,
+                'fov': CAMERA_FOV,
+                'sensor_tick': CAMERA_TICK,
+            },
+            'priority': 'normal',  # camera TTC is only reported, the EBS decision uses the radar
+        },
+    ]
+}
 
 
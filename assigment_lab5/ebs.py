@@ -0,0 +1,43 @@
+"""
+Emergency Braking System decision logic, free of any CARLA dependency.
+
+ebs_step is what main.py runs every control cycle; ebs_step_vec is the same
+state machine over NumPy arrays, used by the surrogate simulator to advance
+thousands of scenarios in lockstep.
+"""
+
+import numpy as np
+
+from assigment_lab5 import config
+
+# (throttle, brake) applied in each state
+BRAKE_CONTROL = (0.0, 1.0)
+DRIVE_CONTROL = (1.0, 0.0)
+
+
+def ebs_step(ttc, detection_counter,
+             ttc_threshold=config.TTC_THRESHOLD,
+             stable_threshold=config.STABLE_DETECTION_THRESHOLD):
+    """
+    One control cycle of the EBS: debounce the TTC check and decide whether to brake.
+
+    Args:
+        ttc (float): current minimum Time To Collision [s].
+        detection_counter (int): consecutive cycles with ttc below the threshold so far.
+
+    Returns:
+        tuple: (brake, detection_counter) with brake True for full braking.
+    """
+    if ttc < ttc_threshold:
+        detection_counter += 1
+    else:
+        detection_counter = 0
+    return detection_counter >= stable_threshold, detection_counter
+
+
+def ebs_step_vec(ttc, detection_counter,
+                 ttc_threshold=config.TTC_THRESHOLD,
+                 stable_threshold=config.STABLE_DETECTION_THRESHOLD):
+    """ebs_step over arrays of scenarios: same semantics, element-wise"""
+    detection_counter = np.where(ttc < ttc_threshold, detection_counter + 1, 0)
+    return detection_counter >= stable_threshold, detection_counter
@@ -1,20 +1,36 @@
 import carla
 import time
 
-import config
-import sensor_callbacks
-from carla_manager import CarlaManager
-from spawner import Spawner
+import numpy as np
+
+from assigment_lab5 import config
+from assigment_lab5 import sensor_callbacks
+from assigment_lab5.ebs import BRAKE_CONTROL, DRIVE_CONTROL, ebs_step
+from assigment_lab5.carla_manager import CarlaManager
+from assigment_lab5.spawner import Spawner
+from utils.camera_ttc import ScaleTTCEstimator, camera_intrinsics
+from utils.rig import SensorRig
+from utils.traffic import BackgroundTraffic
+from utils.visualizer import Visualizer
 
 def main():
     #shared dictionary
-    radar_data = {'min_ttc': float('inf')}
+    radar_data = {'min_ttc': float('inf'), 'camera_ttc': float('inf')}
 
-    with CarlaManager() as manager:
-        spawner = Spawner(manager.world, manager.actor_list)
+    #camera mosaic + radar bird's-eye view with the TTC, drawn off the control loop
+    visualizer = Visualizer(
+        cameras={'front_camera': (config.CAMERA_HEIGHT, config.CAMERA_WIDTH, 3)},
+        radar_points=config.RADAR_POINTS_PER_SECOND,
+        fps=config.DISPLAY_FPS,
+        output=config.VIDEO_OUTPUT,
+        headless=config.HEADLESS
+    )
+
+    with CarlaManager() as manager, visualizer:
+        spawner = Spawner(manager.world, manager.registry, manager.client)
 
         #Spaning section
-        ego_vehicle = spawner.spawn_vehicle(config.EGO_VEHICLE_MODEL)
+        ego_vehicle = spawner.spawn_vehicle(config.EGO_VEHICLE_MODEL, hero=True)
         if not ego_vehicle: return
 
         # Spawn a target vehicle 10 meters in front of the ego vehicle
@@ -33,19 +49,42 @@ def main():
         target_vehicle = spawner.spawn_vehicle(config.TARGET_VEHICLE_MODEL, spawn_point=target_spawn_point)
         if not target_vehicle: return
 
+        if config.BACKGROUND_TRAFFIC > 0:
+            manager.traffic = BackgroundTraffic(
+                manager.client, manager.world, manager.registry,
+                tm_port=config.TM_PORT,
+                hybrid_radius=config.HYBRID_PHYSICS_RADIUS,
+                actor_active_distance=config.ACTOR_ACTIVE_DISTANCE
+            )
+            manager.traffic.spawn(config.BACKGROUND_TRAFFIC, avoid=[ego_vehicle.get_location(), target_vehicle.get_location()])
+
         #Setting sensor and spectator
         spectator = manager.world.get_spectator()
 
-        radar_sensor = spawner.spawn_radar(ego_vehicle)
+        rig = SensorRig.from_dict(config.SENSOR_RIG)
+        sensors = spawner.spawn_rig(rig, ego_vehicle)
+        radar_sensor = sensors['front_radar']
         if not radar_sensor: return
 
         #start listen sensor
-        radar_sensor.listen(lambda data: sensor_callbacks.radar_callback(data, radar_data))
+        radar_extrinsic = rig.extrinsics[rig.index('front_radar')]
+        radar_sensor.listen(lambda data: sensor_callbacks.radar_callback(data, radar_data, radar_extrinsic))
         print("Radar sensor is activated")
 
+        camera_sensor = sensors.get('front_camera')
+        if camera_sensor:
+            ego_to_camera = np.linalg.inv(rig.extrinsics[rig.index('front_camera')])
+            intrinsics = camera_intrinsics(config.CAMERA_WIDTH, config.CAMERA_HEIGHT, config.CAMERA_FOV)
+            camera_estimator = ScaleTTCEstimator(max_patch=config.CAMERA_TTC_MAX_PATCH,
+                                                 smoothing=config.CAMERA_TTC_SMOOTHING)
+            camera_sensor.listen(lambda image: sensor_callbacks.camera_ttc_callback(
+                image, radar_data, camera_estimator, ego_to_camera, intrinsics))
+            print("Front camera is activated (camera TTC)")
+
         print("Start EBS test...")
 
         detection_counter = 0
+        published_sweep = published_image = None
         while True:
            #manager.world.tick()
 
@@ -55,17 +94,29 @@ def main():
             spectator.set_transform(carla.Transform(spectator_location, ego_transform.rotation))
 
             current_ttc = radar_data['min_ttc']
-            if current_ttc < config.TTC_THRESHOLD:
-                detection_counter += 1
-            else:
-                detection_counter = 0
-
-            if detection_counter >= config.STABLE_DETECTION_THRESHOLD:
-                control = carla.VehicleControl(throttle=0.0, brake=1.0, steer=0.0)
+            brake, detection_counter = ebs_step(current_ttc, detection_counter)
+
+            #publish only new data (every callback stores new objects); never blocks, a busy renderer means retry next loop
+            sweep = radar_data.get('sweep')
+            if sweep is not None and sweep is not published_sweep:
+                if visualizer.publish_radar(sweep[0], sweep[1], current_ttc):
+                    published_sweep = sweep
+            camera_image = radar_data.get('camera_image')
+            if camera_image is not None and camera_image is not published_image:
+                if visualizer.publish_camera('front_camera', camera_image):
+                    published_image = camera_image
+            if visualizer.should_close:
+                print("Visualizer closed, stopping EBS test")
+                break
+
+            if brake:
+                throttle, brake_value = BRAKE_CONTROL
+                control = carla.VehicleControl(throttle=throttle, brake=brake_value, steer=0.0)
                 ego_vehicle.apply_control(control)
-                print(f"OBSTACLE DETECTED! TTC: {current_ttc:.2f}s! BRAKING ACTIVATED")
+                print(f"OBSTACLE DETECTED! TTC: {current_ttc:.2f}s (camera: {radar_data['camera_ttc']:.2f}s)! BRAKING ACTIVATED")
             else:
-                control = carla.VehicleControl(throttle=1.0, brake=0.0, steer=0.0)
+                throttle, brake_value = DRIVE_CONTROL
+                control = carla.VehicleControl(throttle=throttle, brake=brake_value, steer=0.0)
                 ego_vehicle.apply_control(control)
 
                 #if detection_counter > 0:
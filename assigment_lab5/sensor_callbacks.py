@@ -1,27 +1,57 @@
 """Callback function for sprocessing data from CARLA sensor"""
 
 import numpy as np
-import math
 
-def radar_callback(radar_data, data_dict):
+from assigment_lab5 import config
+from utils import camera_ttc, radar
+
+
+def radar_callback(radar_data, data_dict, extrinsic=None, sweep_buffer=None):
     """
     Callback function for the radar sensor
-    Processes radar detections to find the minimum Time To Collision
+    Converts the whole sweep to ego-frame points and computes the minimum
+    Time To Collision among the returns inside the ego lane corridor and
+    height band, so parked cars at the edge of the FOV and the road surface
+    ahead do not trigger the EBS.
+
+    Args:
+        extrinsic: 4x4 radar-to-ego matrix (SensorRig.extrinsics), None for the sensor frame.
+        sweep_buffer: optional radar.RadarSweepBuffer accumulating the last sweeps.
     """
+    # Radar velocity is positive for objects moving away, negative for objects approaching.
+    # time_to_collision only keeps approaching returns (closing speed > 0.1 m/s).
+    points, in_path, min_ttc = radar.process_sweep(
+        radar_data.raw_data,
+        extrinsic,
+        half_width=config.LANE_HALF_WIDTH,
+        max_range=config.RADAR_RANGE,
+        min_height=config.IN_PATH_MIN_HEIGHT,
+        max_height=config.IN_PATH_MAX_HEIGHT
+    )
+    if sweep_buffer is not None:
+        sweep_buffer.push(points, radar_data.frame)
 
-    min_ttc = float('inf')
-    # process each detection from the radar sweep
-    for detection in radar_data:
-        distance = detection.depth
-        relative_velocity  = detection.velocity
+    # One assignment, so the main loop never pairs the points of a sweep with the mask of another
+    data_dict['sweep'] = (points, in_path)
+    data_dict['min_ttc'] = min_ttc
 
-        # We are interested in objects we are approaching.
-        # Radar velocity is positive for objects moving away, negative for objects approaching.
-        # We define closing_speed as positive when approaching.
-        closing_speed = -relative_velocity
 
-        if closing_speed > 0.1:
-            ttc  = distance / closing_speed
-            min_ttc = min(min_ttc, ttc)
+def camera_ttc_callback(image, data_dict, estimator, ego_to_camera, intrinsics):
+    """
+    Callback function for the front camera
+    Estimates the Time To Collision from the image scale change of the
+    lead vehicle (utils.camera_ttc) and publishes it as 'camera_ttc',
+    next to the radar 'min_ttc'. The lead vehicle is the nearest in-path
+    return of the latest radar 'sweep': without one the camera TTC is inf.
 
-    data_dict['min_ttc'] = min_ttc
+    Args:
+        estimator: camera_ttc.ScaleTTCEstimator keeping the previous frame.
+        ego_to_camera: 4x4 ego-to-camera matrix (inverse of the camera extrinsic).
+        intrinsics: 3x3 camera_ttc.camera_intrinsics of the camera.
+    """
+    # raw_data is BGRA, the estimator only reads the window around the lead vehicle
+    frame = np.frombuffer(image.raw_data, dtype=np.uint8).reshape((image.height, image.width, 4))
+    points, in_path = data_dict.get('sweep', (None, None))
+    roi = camera_ttc.lead_vehicle_roi(points, in_path, ego_to_camera, intrinsics, (image.width, image.height))
+    data_dict['camera_ttc'] = estimator.update(frame, image.timestamp, roi)
+    data_dict['camera_image'] = frame[:, :, :3]  # BGR view for the visualizer
@@ -1,25 +1,27 @@
 """Spawner handles the generation of actors """
 
-import carla
 import random
-import config
 
 
 class Spawner:
     "handles the generation of actors"
-    def __init__(self, world, actor_list):
+    def __init__(self, world, registry, client=None):
         self.world = world
-        self.actor_list = actor_list
+        self.registry = registry
+        self.client = client
         self.blueprint_library = self.world.get_blueprint_library()
 
 
-    def spawn_vehicle(self, model, spawn_point=None, autopilot=False):
+    def spawn_vehicle(self, model, spawn_point=None, autopilot=False, hero=False):
         """Spawn veichles according to the model at a specific random point
 
+        hero=True marks the ego vehicle (role_name 'hero'), the centre of the
+        Traffic Manager hybrid physics area.
+
         Returns:
             Carla.Actor: spawned veichles actor, or None on failure.
         """
-        vehicle_bp = self.blueprint_library.filter(model)[0]
+        vehicle_bp = self.registry.tag(self.blueprint_library.filter(model)[0], 'hero' if hero else 'vehicle')
 
         if spawn_point is None:
             spawn_points = self.world.get_map().get_spawn_points()
@@ -32,32 +34,22 @@ class Spawner:
 
         if vehicle:
             print(f"Spawn succeeded, model: {model}")
+            self.registry.append(vehicle)
+            if hero:
+                # Lets a later orphan sweep recognise the hero even if we crash before the rig is mounted
+                self.registry.anchor_hero(vehicle)
             vehicle.set_autopilot(autopilot)
-            self.actor_list.append(vehicle)
         else:
             print(f"ERROR: Spawn failed, model: {model}")
         return vehicle
 
 
-    def spawn_radar(self, parent_vehicle):
-        """Spawn radar according to the model at a specific random point"""
-        radar_bp = self.blueprint_library.find('sensor.other.radar')
-        radar_bp.set_attribute('horizontal_fov', str(config.RADAR_HORIZONTAL_FOV))
-        radar_bp.set_attribute('vertical_fov', str(config.RADAR_VERTICAL_FOV))
-        radar_bp.set_attribute('points_per_second', str(config.RADAR_POINTS_PER_SECOND))
-        radar_bp.set_attribute('range', str(config.RADAR_RANGE))
-
-        radar_transform = carla.Transform(carla.Location(x=2.5, z=1.0))
-        radar_sensor = self.world.spawn_actor(
-            radar_bp,
-            radar_transform,
-            attach_to=parent_vehicle
-        )
-
-        if radar_sensor:
-            print("Radar sensor spawned and attached to vehicle")
-            self.actor_list.append(radar_sensor)
-        else:
-            print("ERROR: Radar sensor spawn failed")
+    def spawn_rig(self, rig, parent_vehicle):
+        """Spawn every sensor of a SensorRig on the vehicle with one batch command
 
-        return radar_sensor
\ No newline at end of file
+        Returns:
+            dict: sensor name -> Carla.Actor (None for sensors that failed to spawn).
+        """
+        if self.client is None:
+            raise RuntimeError("Spawner needs a client to spawn a rig in batch")
+        return rig.spawn(self.client, self.world, parent_vehicle, self.registry)
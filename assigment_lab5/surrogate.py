@@ -0,0 +1,172 @@
+"""
+Vectorized longitudinal surrogate of the lab 5 EBS scenario.
+
+Instead of a live CARLA run, each scenario is a 1-D ego/target pair on a
+straight lane (gap, speeds, target braking) observed by a noisy radar with
+dropouts. All scenarios advance in lockstep as NumPy arrays over fixed control
+steps and the EBS decision is the same state machine main.py runs
+(assigment_lab5.ebs), so millions of cases can be screened on CPU before
+spending simulator time on the interesting ones.
+
+Run from the repository root:
+    python -m assigment_lab5.surrogate --scenarios 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from assigment_lab5 import config
+from assigment_lab5.ebs import ebs_step_vec
+
+CONTROL_PERIOD = 0.05  # seconds, one radar sweep / control cycle
+DURATION = 10.0  # seconds simulated per scenario
+EGO_MAX_SPEED = 30.0  # m/s, throttle=1.0 accelerates up to this speed
+MIN_CLOSING_SPEED = 0.1  # m/s, same cut-off as the radar callback
+
+# Uniform sampling ranges (low, high) of the scenario parameters
+DEFAULT_RANGES = {
+    'gap': (5.0, 60.0),  # initial bumper-to-bumper distance [m]
+    'v_ego': (0.0, 25.0),  # initial ego speed [m/s]
+    'v_target': (0.0, 20.0),  # initial target speed [m/s]
+    'target_decel': (0.0, 8.0),  # target braking deceleration [m/s^2]
+    'target_brake_time': (0.0, 3.0),  # when the target starts braking [s]
+    'ego_accel': (2.5, 4.5),  # ego acceleration at full throttle [m/s^2]
+    'ego_brake_decel': (6.0, 9.0),  # ego deceleration at full brake [m/s^2]
+    'radar_noise': (0.0, 0.5),  # radar depth noise standard deviation [m]
+    'velocity_noise': (0.0, 0.3),  # radar velocity noise standard deviation [m/s]
+    'dropout': (0.0, 0.3),  # probability of a sweep without the target
+}
+
+
+def sample_scenarios(n, rng, ranges=None):
+    """Draws n scenarios, returned as a dict of float32 arrays (one entry per parameter)"""
+    ranges = dict(DEFAULT_RANGES, **(ranges or {}))
+    return {name: rng.uniform(low, high, n).astype(np.float32) for name, (low, high) in ranges.items()}
+
+
+def simulate(scenarios, rng, dt=CONTROL_PERIOD, duration=DURATION,
+             ttc_threshold=config.TTC_THRESHOLD, stable_threshold=config.STABLE_DETECTION_THRESHOLD,
+             radar_range=config.RADAR_RANGE):
+    """
+    Runs every scenario in lockstep for duration/dt control steps.
+
+    Targets farther than ``radar_range`` (measured gap) are not detected, as in CARLA.
+
+    Returns:
+        dict of arrays: collided, impact_speed [m/s], min_gap [m],
+        stop_gap [m] (gap when the ego first stops while braking, NaN if it never does),
+        brake_time [s] (first full-brake command, NaN if never).
+    """
+    gap = scenarios['gap'].copy()
+    v_ego = scenarios['v_ego'].copy()
+    v_target = scenarios['v_target'].copy()
+    n = len(gap)
+
+    counter = np.zeros(n, dtype=np.int32)
+    collided = np.zeros(n, dtype=bool)
+    impact_speed = np.zeros(n, dtype=np.float32)
+    min_gap = gap.copy()
+    stop_gap = np.full(n, np.nan, dtype=np.float32)
+    brake_time = np.full(n, np.nan, dtype=np.float32)
+    inf = np.float32(np.inf)
+
+    for step in range(int(round(duration / dt))):
+        t = step * dt
+
+        # Radar measurement of the target: noisy depth/closing speed, random dropouts
+        closing = v_ego - v_target
+        measured_gap = gap + scenarios['radar_noise'] * rng.standard_normal(n, dtype=np.float32)
+        measured_closing = closing + scenarios['velocity_noise'] * rng.standard_normal(n, dtype=np.float32)
+        detected = (rng.random(n, dtype=np.float32) >= scenarios['dropout']) & (measured_closing > MIN_CLOSING_SPEED)
+        detected &= measured_gap <= radar_range
+        ttc = np.where(detected, measured_gap / np.maximum(measured_closing, MIN_CLOSING_SPEED), inf)
+
+        brake, counter = ebs_step_vec(ttc, counter, ttc_threshold, stable_threshold)
+        brake_time = np.where(brake & np.isnan(brake_time), np.float32(t), brake_time)
+
+        # Ego longitudinal dynamics: full brake or full throttle up to the speed cap
+        accel = np.where(brake, -scenarios['ego_brake_decel'],
+                         np.where(v_ego < EGO_MAX_SPEED, scenarios['ego_accel'], 0.0))
+        new_v_ego = np.clip(v_ego + accel * dt, 0.0, EGO_MAX_SPEED)
+
+        target_braking = t >= scenarios['target_brake_time']
+        new_v_target = np.maximum(v_target - np.where(target_braking, scenarios['target_decel'], 0.0) * dt, 0.0)
+
+        # Trapezoidal integration of the relative motion; collided scenarios are frozen
+        moving = ~collided
+        gap = np.where(moving, gap - 0.5 * ((v_ego + new_v_ego) - (v_target + new_v_target)) * dt, gap)
+        v_ego = np.where(moving, new_v_ego, v_ego)
+        v_target = np.where(moving, new_v_target, v_target)
+
+        new_collision = moving & (gap <= 0.0)
+        impact_speed = np.where(new_collision, v_ego - v_target, impact_speed)
+        collided |= new_collision
+        min_gap = np.minimum(min_gap, np.maximum(gap, 0.0))
+
+        stopped = moving & brake & (v_ego == 0.0) & np.isnan(stop_gap)
+        stop_gap = np.where(stopped, gap, stop_gap)
+
+    return {
+        'collided': collided,
+        'impact_speed': impact_speed,
+        'min_gap': min_gap,
+        'stop_gap': stop_gap,
+        'brake_time': brake_time,
+    }
+
+
+def run(n, rng, chunk=100000, **kwargs):
+    """Simulates n sampled scenarios in chunks of ``chunk`` to bound memory; returns (scenarios, results)"""
+    scenario_chunks, result_chunks = [], []
+    for start in range(0, n, chunk):
+        scenarios = sample_scenarios(min(chunk, n - start), rng)
+        scenario_chunks.append(scenarios)
+        result_chunks.append(simulate(scenarios, rng, **kwargs))
+    merge = lambda chunks: {key: np.concatenate([c[key] for c in chunks]) for key in chunks[0]}
+    return merge(scenario_chunks), merge(result_chunks)
+
+
+def summarize(results, percentiles=(5, 25, 50, 75, 95)):
+    """Prints collision rate and the distributions of impact speed, stopping gap and minimum gap"""
+    n = len(results['collided'])
+    collided = results['collided']
+    print(f"Scenarios: {n}")
+    print(f"Collisions: {collided.sum()} ({collided.mean() * 100:.2f}%)")
+    print(f"Braked at least once: {(~np.isnan(results['brake_time'])).mean() * 100:.2f}%")
+
+    header = ''.join(f"{'p' + str(p):>9}" for p in percentiles)
+    print(f"{'':<22}{header}")
+    rows = (
+        ('impact speed [m/s]', results['impact_speed'][collided]),
+        ('stopping gap [m]', results['stop_gap'][~np.isnan(results['stop_gap'])]),
+        ('min gap [m]', results['min_gap'][~collided]),
+    )
+    for label, values in rows:
+        if len(values):
+            print(f"{label:<22}" + ''.join(f"{v:>9.2f}" for v in np.percentile(values, percentiles)))
+        else:
+            print(f"{label:<22}{'(none)':>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized EBS surrogate simulator")
+    parser.add_argument('--scenarios', type=int, default=100000)
+    parser.add_argument('--chunk', type=int, default=100000, help='scenarios simulated per lockstep batch')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    _, results = run(args.scenarios, rng, chunk=args.chunk)
+    elapsed = time.perf_counter() - start
+
+    summarize(results)
+    steps = int(round(DURATION / CONTROL_PERIOD))
+    print(f"\n{args.scenarios} scenarios x {steps} steps in {elapsed:.2f}s "
+          f"-> {args.scenarios / elapsed * 60:,.0f} scenarios/min")
+
+
+if __name__ == '__main__':
+    main()
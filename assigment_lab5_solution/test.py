@@ -1,38 +1,26 @@
+# Run from the repository root: python -m assigment_lab5_solution.test
 import carla
 import time
 
+from utils.actor_registry import ActorRegistry
+
 client = carla.Client('localhost', 2000)
 client.set_timeout(10.0)
 world = client.get_world()
 
+# Every actor is tagged and tracked, so a crash at any point (even during setup)
+# is cleaned up here or by the orphan sweep of the next run
+registry = ActorRegistry(client, world)
+registry.sweep_orphans()
+
 def spawn_vehicle(vehicle_index=0, spawn_index=0, x_offset=0, y_offset=0, pattern='vehicle.*model3*') -> carla.Vehicle:
     blueprint_library = world.get_blueprint_library()
-    vehicle_bp = blueprint_library.filter(pattern)[vehicle_index]
+    vehicle_bp = registry.tag(blueprint_library.filter(pattern)[vehicle_index], 'vehicle')
     spawn_point = world.get_map().get_spawn_points()[spawn_index]
     spawn_point.location.x += x_offset
     spawn_point.location.y += y_offset
     vehicle = world.spawn_actor(vehicle_bp, spawn_point)
-    return vehicle
-
-# Spawn target vehicle
-target_vehicle = spawn_vehicle(x_offset=50)
-
-time.sleep(10)
-
-# Spawn the vehicle
-ego_vehicle = spawn_vehicle()
-
-spectator = world.get_spectator()
-
-
-# Add the radar sensor
-radar_bp = world.get_blueprint_library().find('sensor.other.radar')
-radar_bp.set_attribute('horizontal_fov', '10')  # Horizontal field of view
-radar_bp.set_attribute('vertical_fov', '10')    # Vertical field of view
-radar_bp.set_attribute('range', '20')           # Maximum range
-
-radar_transform = carla.Transform(carla.Location(x=2.0, z=1.0))
-radar = world.spawn_actor(radar_bp, radar_transform, attach_to=ego_vehicle)
+    return registry.append(vehicle)
 
 # Variable to store the minimum TTC
 min_ttc = float('inf')
@@ -50,10 +38,29 @@ def radar_callback(data: carla.RadarMeasurement):
             if ttc < min_ttc:
                 min_ttc = ttc
 
-# Register the radar callback
-radar.listen(radar_callback)
-
 try:
+    # Spawn target vehicle
+    target_vehicle = spawn_vehicle(x_offset=50)
+
+    time.sleep(10)
+
+    # Spawn the vehicle
+    ego_vehicle = spawn_vehicle()
+
+    spectator = world.get_spectator()
+
+    # Add the radar sensor
+    radar_bp = registry.tag(world.get_blueprint_library().find('sensor.other.radar'), 'radar')
+    radar_bp.set_attribute('horizontal_fov', '10')  # Horizontal field of view
+    radar_bp.set_attribute('vertical_fov', '10')    # Vertical field of view
+    radar_bp.set_attribute('range', '20')           # Maximum range
+
+    radar_transform = carla.Transform(carla.Location(x=2.0, z=1.0))
+    radar = registry.append(world.spawn_actor(radar_bp, radar_transform, attach_to=ego_vehicle))
+
+    # Register the radar callback
+    radar.listen(radar_callback)
+
     while True:
         # TTC threshold (e.g., 2 seconds)
         ttc_threshold = 2.0
@@ -79,7 +86,5 @@ except KeyboardInterrupt:
     print("Keyboard interrupt detected.")
 
 finally:
-    radar.stop()
-    radar.destroy()
-    ego_vehicle.destroy()
-    target_vehicle.destroy()
+    # Stops the radar and destroys every spawned actor, whatever step failed
+    registry.destroy_all()
@@ -0,0 +1,169 @@
+"""
+Throughput and accuracy of the monocular camera TTC stage.
+
+Synthetic 800x600 BGRA frames at 20 FPS from the lab 5 front camera
+(config.SENSOR_RIG pose and fov). The ego drives at EGO_SPEED towards a
+textured wall, so the whole scene expands with the ego's own motion. The
+scenarios are:
+
+- lead closing: a textured lead vehicle closes at CLOSING_SPEED, true TTC = Z / v;
+- lead same speed: the lead vehicle keeps its distance, expected TTC inf;
+- no lead: no in-path radar return, expected TTC inf;
+- no lead, fixed ROI: the same frames measured in a fixed region at the image
+  centre instead of the radar-seeded box, to show the ego-motion false alarms
+  the radar seeding avoids.
+
+The lead vehicle box comes from a simulated in-path radar return (with a few
+cm of noise) through lead_vehicle_roi. Frames are rendered up front; only ROI
+projection + ScaleTTCEstimator.update are timed.
+
+Run from the repository root:
+    python benchmarks/camera_ttc.py [--frames 40] [--fps 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assigment_lab5 import config  # noqa: E402
+from utils.camera_ttc import (VEHICLE_BOTTOM, VEHICLE_HALF_WIDTH, VEHICLE_TOP, ScaleTTCEstimator,  # noqa: E402
+                              camera_intrinsics, lead_vehicle_roi)
+from utils.radar import POINT_FIELDS  # noqa: E402
+from utils.rig import SensorRig  # noqa: E402
+
+EGO_SPEED = 15.0  # m/s
+WALL_DISTANCE = 45.0  # meters from the camera at t=0 (ego-motion TTC 3 s -> 1 s)
+LEAD_DISTANCE = 20.0  # meters from the camera at t=0
+CLOSING_SPEED = 8.0  # m/s
+TEXTURE_PPM = 200  # texture pixels per meter of the lead vehicle rear face
+FIXED_ROI = (0.3, 0.35, 0.7, 0.85)  # image fractions of the old fixed region
+
+
+def textured(shape, rng, blur):
+    noise = rng.integers(0, 256, shape, dtype=np.uint8)
+    texture = cv2.GaussianBlur(noise, (0, 0), blur)
+    return cv2.normalize(texture, None, 0, 255, cv2.NORM_MINMAX)
+
+
+class Scene:
+    """Pinhole renderer of the wall and the lead vehicle rear face seen by the front camera"""
+
+    def __init__(self, rng):
+        rig = SensorRig.from_dict(config.SENSOR_RIG)
+        spec = rig['front_camera']
+        self.width = int(spec.attributes['image_size_x'])
+        self.height = int(spec.attributes['image_size_y'])
+        self.intrinsics = camera_intrinsics(self.width, self.height, float(spec.attributes['fov']))
+        self.extrinsic = rig.extrinsics[rig.index('front_camera')]
+        self.ego_to_camera = np.linalg.inv(self.extrinsic)
+        self.camera_height = self.extrinsic[2, 3]
+
+        self.wall = textured((self.height, self.width), rng, blur=4)
+        size = (int(2 * VEHICLE_HALF_WIDTH * TEXTURE_PPM), int((VEHICLE_TOP - VEHICLE_BOTTOM) * TEXTURE_PPM))
+        self.vehicle = textured((size[1], size[0]), rng, blur=12)
+
+    def render(self, wall_depth, lead_depth):
+        """BGRA frame with the wall at ``wall_depth`` and the lead vehicle at ``lead_depth`` (None: absent)"""
+        focal, cx, cy = self.intrinsics[0, 0], self.intrinsics[0, 2], self.intrinsics[1, 2]
+        # The wall expands around the principal point (focus of expansion when driving straight)
+        scale = WALL_DISTANCE / wall_depth
+        matrix = np.array([[scale, 0.0, cx * (1 - scale)], [0.0, scale, cy * (1 - scale)]])
+        gray = cv2.warpAffine(self.wall, matrix, (self.width, self.height), borderMode=cv2.BORDER_REFLECT)
+
+        if lead_depth is not None:
+            k = focal / (lead_depth * TEXTURE_PPM)
+            left = cx - focal * VEHICLE_HALF_WIDTH / lead_depth
+            upper = cy - focal * (VEHICLE_TOP - self.camera_height) / lead_depth
+            matrix = np.array([[k, 0.0, left], [0.0, k, upper]])
+            layer = cv2.warpAffine(self.vehicle, matrix, (self.width, self.height))
+            mask = cv2.warpAffine(np.full_like(self.vehicle, 255), matrix, (self.width, self.height)) > 127
+            gray[mask] = layer[mask]
+        return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGRA)
+
+    def radar(self, lead_depth, rng):
+        """Ego-frame in-path radar return on the lead vehicle rear face (empty without a lead)"""
+        points = np.zeros((0 if lead_depth is None else 1, len(POINT_FIELDS)), dtype=np.float32)
+        if lead_depth is not None:
+            points[0, :3] = (lead_depth + self.extrinsic[0, 3] + rng.normal(0, 0.05),
+                             rng.normal(0, 0.05), rng.uniform(VEHICLE_BOTTOM, VEHICLE_TOP))
+        return points, np.ones(len(points), dtype=bool)
+
+
+def scenario(scene, frames, fps, lead_speed, rng):
+    """Returns per-frame (image, timestamp, radar points, in-path mask, true TTC)"""
+    samples = []
+    for i in range(frames):
+        t = i / fps
+        wall_depth = WALL_DISTANCE - EGO_SPEED * t
+        if lead_speed is None:
+            lead_depth, truth = None, float('inf')
+        else:
+            closing = EGO_SPEED - lead_speed
+            lead_depth = LEAD_DISTANCE - closing * t
+            truth = lead_depth / closing if closing > 0 else float('inf')
+        points, in_path = scene.radar(lead_depth, rng)
+        samples.append((scene.render(wall_depth, lead_depth), t, points, in_path, truth))
+    return samples
+
+
+def run(scene, samples, fixed_roi=None):
+    """Returns (ms per frame, estimates) of the radar-seeded (or fixed ROI) estimator"""
+    estimator = ScaleTTCEstimator()
+    image_size = (scene.width, scene.height)
+    estimates, elapsed = [], 0.0
+    for image, timestamp, points, in_path, _ in samples:
+        start = time.perf_counter()
+        roi = fixed_roi or lead_vehicle_roi(points, in_path, scene.ego_to_camera, scene.intrinsics, image_size)
+        estimates.append(estimator.update(image, timestamp, roi))
+        elapsed += time.perf_counter() - start
+    return elapsed / len(samples) * 1000.0, np.array(estimates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--frames', type=int, default=40, help='frames per scenario (the lead must not reach the camera)')
+    parser.add_argument('--fps', type=float, default=20.0)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)  # the budget is one core
+    rng = np.random.default_rng(0)
+    scene = Scene(rng)
+    width, height = scene.width, scene.height
+    fixed_roi = (int(FIXED_ROI[0] * width), int(FIXED_ROI[1] * height),
+                 int(FIXED_ROI[2] * width), int(FIXED_ROI[3] * height))
+
+    cases = (
+        ('lead closing', EGO_SPEED - CLOSING_SPEED, None),
+        ('lead same speed', EGO_SPEED, None),
+        ('no lead', None, None),
+        ('no lead, fixed ROI', None, fixed_roi),
+    )
+    print(f"ego {EGO_SPEED:.0f} m/s towards a wall at {WALL_DISTANCE:.0f} m, {args.frames} frames at {args.fps:.0f} FPS,"
+          f" alarm = TTC < {config.TTC_THRESHOLD}s while the true TTC is not\n")
+    print(f"{'scenario':<20}{'ms/frame':>10}{'max FPS':>9}{'median |err| [s]':>18}{'min TTC [s]':>13}"
+          f"{'finite TTC':>12}{'false alarms':>14}")
+    for label, lead_speed, roi in cases:
+        samples = scenario(scene, args.frames, args.fps, lead_speed, rng)
+        per_frame, estimates = run(scene, samples, roi)
+        truth = np.array([sample[-1] for sample in samples])
+
+        # Skip the first frames while the smoothed estimate converges
+        measured = slice(5, None)
+        finite_truth = np.isfinite(truth[measured])
+        errors = np.abs(estimates[measured][finite_truth] - truth[measured][finite_truth])
+        median = f"{np.median(errors):.3f}" if len(errors) else 'n/a'
+        # Frames reporting a TTC where there is nothing to collide with
+        finite = np.isfinite(estimates[measured]) & ~finite_truth
+        alarms = (estimates < config.TTC_THRESHOLD) & (truth >= config.TTC_THRESHOLD)
+        print(f"{label:<20}{per_frame:>10.2f}{1000.0 / per_frame:>9.0f}{median:>18}{estimates.min():>13.2f}"
+              f"{f'{finite.sum()}/{(~finite_truth).sum()}':>12}{f'{alarms.sum()}/{len(samples)}':>14}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Startup-time benchmark for headless sensor workers.
+
+Every module is imported in a fresh interpreter with ``python -X importtime``
+(the same cost a new process-pool worker pays), once from a checkout of the
+baseline revision and once from the current tree. For each module we report
+the cumulative import time and which heavy backends ended up really loaded.
+The baseline is checked out in a temporary ``git worktree``.
+
+Run from the repository root:
+    python benchmarks/import_time.py [--baseline REV] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_BACKENDS = ('numpy', 'cv2', 'carla', 'pygame')
+
+# Modules a headless sensor worker imports (interpreter start-up is the reference row)
+MODULES = (
+    None,
+    'utils.sensor_utils',
+    'utils.spawn_utils',
+    'assigment_lab5.sensor_callbacks',
+    'assigment_lab5.carla_manager',
+)
+
+PROBE = (
+    "\nimport sys"
+    "\nloaded = [n for n in {names!r} if n in sys.modules]"
+    "\nprint('LOADED=' + ','.join(loaded))"
+)
+
+
+def _run(module, root):
+    """Import ``module`` from the tree at ``root`` in a fresh interpreter, return (total_us, loaded_backends)"""
+    code = (f"import {module}" if module else "pass") + PROBE.format(names=HEAVY_BACKENDS)
+    env = dict(os.environ, PYTHONPATH=root, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=root, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        # A backend may be missing in this environment; report it instead of crashing.
+        return None, proc.stderr.strip().splitlines()[-1]
+
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Only top-level entries (single space of indent) so nested imports are not counted twice.
+        if not name.startswith('  '):
+            total_us += int(cumulative)
+    loaded = [out for out in proc.stdout.splitlines() if out.startswith('LOADED=')]
+    return total_us, loaded[0][len('LOADED='):] if loaded else ''
+
+
+def _measure(module, root, repeat):
+    """Returns 'median [ms]' and loaded backends, or 'n/a' and the import error"""
+    samples = []
+    loaded = ''
+    for _ in range(repeat):
+        total_us, loaded = _run(module, root)
+        if total_us is None:
+            return 'n/a', loaded
+        samples.append(total_us / 1000.0)
+    return f"{statistics.median(samples):.1f}", loaded or '-'
+
+
+def _git(*args):
+    return subprocess.run(['git', *args], cwd=REPO_ROOT, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--baseline', default=None, help='revision to compare against (default: root commit)')
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters per module')
+    args = parser.parse_args()
+
+    baseline = args.baseline or _git('rev-list', '--max-parents=0', 'HEAD').splitlines()[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        worktree = os.path.join(tmp, 'baseline')
+        _git('worktree', 'add', '--detach', worktree, baseline)
+        try:
+            print(f"baseline: {baseline[:10]}   median of {args.repeat} fresh interpreters\n")
+            print(f"{'module':<34}{'baseline [ms]':>14}{'current [ms]':>14}  loaded (baseline -> current)")
+            for module in MODULES:
+                old_ms, old_loaded = _measure(module, worktree, args.repeat)
+                new_ms, new_loaded = _measure(module, REPO_ROOT, args.repeat)
+                print(f"{module or 'interpreter only':<34}{old_ms:>14}{new_ms:>14}  {old_loaded} -> {new_loaded}")
+        finally:
+            _git('worktree', 'remove', '--force', worktree)
+
+
+if __name__ == '__main__':
+    main()
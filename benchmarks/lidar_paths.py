@@ -0,0 +1,102 @@
+"""
+Geometric vs semantic LiDAR obstacle distance: cost and accuracy.
+
+Synthetic sweeps seen from a roof LiDAR (z = 2.5 m): a road rising with a
+small grade, raised sidewalks/curbs on both sides and a target vehicle ahead.
+The geometric path (lidar_callback: x > 0 & z > -2.0) is compared with the
+semantic path (semantic_lidar_callback: tag lookup + per-object group-by)
+against the true distance of the target.
+
+Run from the repository root:
+    python benchmarks/lidar_paths.py [--repeat 50]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import sensor_utils  # noqa: E402
+
+SENSOR_HEIGHT = 2.5  # meters above the road at the ego position
+ROAD_GRADE = 0.04  # road rises 4 cm per meter ahead
+TARGET_X = 12.0  # rear bumper of the target vehicle [m]
+TARGET_ID = 42
+
+TAG_ROAD, TAG_SIDEWALK, TAG_CAR = 1, 2, 14
+POINTS_PER_SWEEP = (9000, 56000, 130000)  # 90k, 560k, 1.3M pts/s at 10 Hz
+
+
+class _Measurement:
+    """Stand-in for carla.LidarMeasurement / SemanticLidarMeasurement"""
+
+    def __init__(self, raw_data):
+        self.raw_data = raw_data
+
+
+def synthetic_scene(count, rng):
+    """Returns (raw geometric bytes, raw semantic bytes, true target distance)"""
+    n_target = count // 20
+    n_sidewalk = count // 5
+    n_road = count - n_target - n_sidewalk
+
+    points = np.zeros(count, dtype=sensor_utils.SEMANTIC_LIDAR_DTYPE)
+    road, sidewalk, target = np.split(np.arange(count), [n_road, n_road + n_sidewalk])
+
+    x = rng.uniform(-20.0, 20.0, n_road)
+    points['x'][road] = x
+    points['y'][road] = rng.uniform(-5.0, 5.0, n_road)
+    points['z'][road] = -SENSOR_HEIGHT + ROAD_GRADE * np.maximum(x, 0.0)
+    points['object_tag'][road] = TAG_ROAD
+
+    x = rng.uniform(-20.0, 20.0, n_sidewalk)
+    points['x'][sidewalk] = x
+    points['y'][sidewalk] = rng.choice([-1.0, 1.0], n_sidewalk) * rng.uniform(5.0, 8.0, n_sidewalk)
+    points['z'][sidewalk] = -SENSOR_HEIGHT + 0.15 + ROAD_GRADE * np.maximum(x, 0.0)
+    points['object_tag'][sidewalk] = TAG_SIDEWALK
+
+    # Rear face of the target vehicle, from bumper height to the roof
+    base = -SENSOR_HEIGHT + ROAD_GRADE * TARGET_X
+    points['x'][target] = TARGET_X
+    points['y'][target] = rng.uniform(-0.9, 0.9, n_target)
+    points['z'][target] = rng.uniform(base + 0.3, base + 1.4, n_target)
+    points['object_tag'][target] = TAG_CAR
+    points['object_idx'][target] = TARGET_ID
+
+    target_points = points[target]
+    truth = float(np.sqrt(target_points['x'] ** 2 + target_points['y'] ** 2 + target_points['z'] ** 2).min())
+
+    # Geometric LiDAR layout: x, y, z, intensity
+    geometric = np.zeros((count, 4), dtype=np.float32)
+    geometric[:, 0], geometric[:, 1], geometric[:, 2] = points['x'], points['y'], points['z']
+    return geometric.tobytes(), points.tobytes(), truth
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=50, help='timed sweeps per size')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'pts/sweep':>10}{'truth [m]':>11}{'geom [m]':>10}{'sem [m]':>9}"
+          f"{'geom [us]':>11}{'sem [us]':>10}")
+    for count in POINTS_PER_SWEEP:
+        geometric_raw, semantic_raw, truth = synthetic_scene(count, rng)
+        geometric, semantic = _Measurement(geometric_raw), _Measurement(semantic_raw)
+        geometric_result, semantic_result = {}, {}
+
+        geometric_us = timeit.timeit(
+            lambda: sensor_utils.lidar_callback(geometric, geometric_result), number=args.repeat) / args.repeat * 1e6
+        semantic_us = timeit.timeit(
+            lambda: sensor_utils.semantic_lidar_callback(semantic, semantic_result), number=args.repeat) / args.repeat * 1e6
+
+        print(f"{count:>10}{truth:>11.2f}{geometric_result['distance']:>10.2f}{semantic_result['distance']:>9.2f}"
+              f"{geometric_us:>11.1f}{semantic_us:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Simulation step time vs number of background vehicles.
+
+Switches the world to synchronous mode, spawns a hero vehicle and then, for
+each N, N Traffic Manager autopilot vehicles (utils.traffic). After a short
+warm-up it times ``world.tick()`` and reports mean/p95 step time with and
+without hybrid physics. Original world settings are restored at the end.
+
+Needs a running CARLA server. Run from the repository root:
+    python benchmarks/traffic_scaling.py [--counts 10 50 100 200 300] [--ticks 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import carla  # noqa: E402
+
+from utils.actor_registry import ActorRegistry  # noqa: E402
+from utils.traffic import BackgroundTraffic  # noqa: E402
+
+
+def time_ticks(world, ticks, warmup):
+    for _ in range(warmup):
+        world.tick()
+    samples = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        world.tick()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    samples.sort()
+    return statistics.mean(samples), samples[int(0.95 * (len(samples) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=2000)
+    parser.add_argument('--tm-port', type=int, default=8000)
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 50, 100, 200, 300])
+    parser.add_argument('--ticks', type=int, default=200, help='timed ticks per configuration')
+    parser.add_argument('--warmup', type=int, default=40)
+    parser.add_argument('--delta', type=float, default=0.05, help='fixed_delta_seconds')
+    parser.add_argument('--hybrid-radius', type=float, default=70.0)
+    args = parser.parse_args()
+
+    client = carla.Client(args.host, args.port)
+    client.set_timeout(20.0)
+    world = client.get_world()
+    original_settings = world.get_settings()
+
+    registry = ActorRegistry(client, world)
+    registry.sweep_orphans()
+    try:
+        settings = world.get_settings()
+        settings.synchronous_mode = True
+        settings.fixed_delta_seconds = args.delta
+        world.apply_settings(settings)
+
+        hero_bp = registry.tag(world.get_blueprint_library().filter('vehicle.audi.tt')[0], 'hero')
+        hero = registry.append(world.spawn_actor(hero_bp, world.get_map().get_spawn_points()[0]))
+        registry.anchor_hero(hero)
+        world.tick()
+
+        print(f"{'vehicles':>9}{'hybrid':>8}{'spawned':>9}{'mean [ms]':>11}{'p95 [ms]':>10}{'RT factor':>11}")
+        for hybrid in (False, True):
+            traffic = BackgroundTraffic(client, world, registry, tm_port=args.tm_port,
+                                        hybrid_physics=hybrid, hybrid_radius=args.hybrid_radius, seed=0)
+            for count in args.counts:
+                vehicles = traffic.spawn(count, avoid=[hero.get_location()])
+                mean, p95 = time_ticks(world, args.ticks, args.warmup)
+                # Simulated seconds per wall-clock second
+                print(f"{count:>9}{str(hybrid):>8}{len(vehicles):>9}{mean:>11.1f}{p95:>10.1f}"
+                      f"{args.delta * 1000.0 / mean:>11.2f}")
+                traffic.destroy()
+                world.tick()
+    finally:
+        registry.destroy_all()
+        world.apply_settings(original_settings)
+
+
+if __name__ == '__main__':
+    main()
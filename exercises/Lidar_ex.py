@@ -16,23 +16,32 @@
 # - Apply the brakes if the distance is less than a threshold.
 
 import carla
-import cv2
-import numpy as np
-import random
 import time
 
 import utils.spawn_utils
 import utils.sensor_utils
+from utils.actor_registry import ActorRegistry
+from utils.visualizer import Visualizer
 
 
 # --- Costanti di configurazione ---
 HOST = 'localhost'
 PORT = 2000
+# True: LIDAR semantico, gli ostacoli sono riconosciuti dai tag (niente strada/marciapiede nella distanza)
+# False (default): LIDAR classico con filtro geometrico su x/z, come nell'esercizio originale
+SEMANTIC_LIDAR = False
+LIDAR_POINTS_PER_SECOND = 90000  # Limite superiore dei punti di un singolo frame
+DISPLAY_FPS = 15  # Frequenza della vista dall'alto, indipendente da world.tick()
+VIDEO_OUTPUT = None  # Es. 'lidar.mp4' per salvare il video (con HEADLESS = True nessuna finestra)
+HEADLESS = False
 
 def main():
 
-    actor_list = []  # Lista per tenere traccia di tutti gli attori creati (veicolo, sensori)
+    registry = None  # Tiene traccia di tutti gli attori creati (veicolo, sensori), anche in caso di crash
     lidar_data = {'distance' : float('inf')}
+    # Vista dall'alto del LIDAR in un processo separato: il disegno non rallenta il ciclo di frenata
+    visualizer = Visualizer(lidar_points=LIDAR_POINTS_PER_SECOND, fps=DISPLAY_FPS,
+                            output=VIDEO_OUTPUT, headless=HEADLESS)
 
 
     try:
@@ -43,19 +52,20 @@ def main():
         world = client.get_world()
         print("Connessione riuscita!")
 
+        # Rimuove gli attori rimasti da esecuzioni precedenti terminate senza pulizia
+        registry = ActorRegistry(client, world)
+        registry.sweep_orphans()
+
         spectator = world.get_spectator()
 
         #spawn actors with sensor
-        ego_vehicle = utils.spawn_utils.spawn_vehicle(world, 'vehicle.audi.tt')
+        ego_vehicle = utils.spawn_utils.spawn_vehicle(world, 'vehicle.audi.tt', registry)
         if ego_vehicle is None:
             return
-        actor_list.append(ego_vehicle)
-
 
-        target_vehicle = utils.spawn_utils.spawn_vehicle(world, 'vehicle.volkswagen.t2')
+        target_vehicle = utils.spawn_utils.spawn_vehicle(world, 'vehicle.volkswagen.t2', registry)
         if target_vehicle is None:
             return
-        actor_list.append(target_vehicle)
 
         ego_transform = ego_vehicle.get_transform()
 
@@ -73,28 +83,29 @@ def main():
         BRAKE_THRESHOLD = 5.0  # Metri. Se un ostacolo è più vicino, si frena.
         SENSOR_RANGE = 20.0  # Metri. Portata massima del LIDAR.
 
-        blueprint_library = world.get_blueprint_library()
-        lidar_bp = blueprint_library.find('sensor.lidar.ray_cast')
-
-        # Configura gli attributi del LIDAR
-        lidar_bp.set_attribute('channels', '32')
-        lidar_bp.set_attribute('points_per_second', '90000')
-        lidar_bp.set_attribute('rotation_frequency', '10')
-        lidar_bp.set_attribute('range', f'{SENSOR_RANGE}')
-
         # Posiziona il LIDAR sul tetto del veicolo ego
-        lidar_transform = carla.Transform(carla.Location(z=2.5))
-        lidar_sensor = world.spawn_actor(lidar_bp, lidar_transform, attach_to=ego_vehicle)
-        actor_list.append(lidar_sensor)
+        lidar_sensor = utils.spawn_utils.spawn_lidar(world, ego_vehicle, carla.Transform(carla.Location(z=2.5)),
+                                                     semantic=SEMANTIC_LIDAR, sensor_range=SENSOR_RANGE,
+                                                     points_per_second=LIDAR_POINTS_PER_SECOND,
+                                                     registry=registry)
+        if lidar_sensor is None:
+            return
 
         # Avvia il sensore con il callback
-        lidar_sensor.listen(lambda data: utils.sensor_utils.lidar_callback(data, lidar_data))
+        if SEMANTIC_LIDAR:
+            # I punti che colpiscono il veicolo ego non sono ostacoli
+            ego_id = ego_vehicle.id
+            lidar_sensor.listen(lambda data: utils.sensor_utils.semantic_lidar_callback(data, lidar_data, (ego_id,)))
+        else:
+            lidar_sensor.listen(lambda data: utils.sensor_utils.lidar_callback(data, lidar_data))
         print("Sensore LIDAR attivo.")
+        visualizer.start()
         # --- 4. CICLO PRINCIPALE DI CONTROLLO ---
         print("\nInizio del test di frenata di emergenza.")
         print(
             f"Il veicolo avanzerà lentamente. Se un ostacolo è a meno di {BRAKE_THRESHOLD}m, i freni verranno applicati.")
         print("Premi Ctrl+C per terminare.")
+        published = None  # Ultima nuvola copiata nel visualizzatore (ogni callback crea un nuovo array)
         while True:
             world.tick()
 
@@ -105,6 +116,15 @@ def main():
             # Ottieni la distanza più recente calcolata dal callback
             current_distance = lidar_data['distance']
 
+            # Pubblica solo una nuvola nuova: non blocca mai, se il visualizzatore è occupato si riprova al giro dopo
+            points = lidar_data.get('points')
+            if points is not None and points is not published:
+                if visualizer.publish_lidar(points):
+                    published = points
+            if visualizer.should_close:
+                print("\nTasto 'q' premuto. Chiusura in corso...")
+                break
+
             # Logica di controllo
             if current_distance < BRAKE_THRESHOLD:
                 # OSTACOLO RILEVATO! APPLICA I FRENI
@@ -129,10 +149,10 @@ def main():
         # --- 5. PULIZIA DEGLI ATTORI ---
         # Questo blocco viene eseguito sempre, sia in caso di errore che di uscita normale.
         print("Pulizia degli attori...")
-        for actor in actor_list:
-            if actor.is_alive:
-                print(f"Distruggendo: {actor.type_id}")
-                actor.destroy()
+        visualizer.close()  # Chiude la finestra e completa il file video
+        # Ferma i sensori e distrugge tutti gli attori della sessione con un'unica chiamata batch
+        if registry is not None:
+            registry.destroy_all()
 
         print("Script terminato.")
 
@@ -0,0 +1 @@
+"""Standalone CARLA exercises. Run from the repository root, e.g. ``python -m exercises.lab4``."""
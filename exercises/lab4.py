@@ -1,8 +1,9 @@
 import carla
-import cv2  # Libreria per la visualizzazione delle immagini
 import numpy as np  # Libreria per la gestione degli array numerici (le immagini sono array)
 import random
-import time
+
+from utils.actor_registry import ActorRegistry
+from utils.visualizer import Visualizer
 
 # --- Costanti di configurazione ---
 HOST = 'localhost'
@@ -10,16 +11,19 @@ PORT = 2000
 IMG_WIDTH = 800
 IMG_HEIGHT = 600
 FOV = 110  # Campo visivo della fotocamera in gradi
+DISPLAY_FPS = 15  # Frequenza di visualizzazione, indipendente da world.tick()
+VIDEO_OUTPUT = None  # Es. 'lab4.mp4' per salvare il video (con HEADLESS = True nessuna finestra)
+HEADLESS = False
 
 
-def spawn_vehicle(world):
+def spawn_vehicle(world, registry):
     """
     Sceglie un veicolo a caso e lo spawn in un punto di spawn valido.
     Ritorna l'attore del veicolo o None se lo spawn fallisce.
     """
     blueprint_library = world.get_blueprint_library()
     # Scegliamo un veicolo specifico per semplicità, ma potremmo sceglierne uno a caso
-    vehicle_bp = blueprint_library.filter('vehicle.audi.tt')[0]
+    vehicle_bp = registry.tag(blueprint_library.filter('vehicle.audi.tt')[0], 'vehicle')
 
     spawn_points = world.get_map().get_spawn_points()
     if not spawn_points:
@@ -31,6 +35,7 @@ def spawn_vehicle(world):
 
     if vehicle:
         print(f"Veicolo spawnato con successo: {vehicle.type_id}")
+        registry.append(vehicle)
         # Disattiviamo l'autopilota per tenerlo fermo
         vehicle.set_autopilot(False)
     else:
@@ -39,7 +44,7 @@ def spawn_vehicle(world):
     return vehicle
 
 
-def spawn_camera(world, vehicle):
+def spawn_camera(world, vehicle, registry):
     """
     Crea un sensore fotocamera e lo attacca al veicolo.
     Ritorna l'attore della fotocamera.
@@ -52,6 +57,7 @@ def spawn_camera(world, vehicle):
     camera_bp.set_attribute('image_size_y', f'{IMG_HEIGHT}')
     camera_bp.set_attribute('fov', f'{FOV}')
     camera_bp.set_attribute('sensor_tick', '0.0')  # 0.0 per il massimo frame rate possibile
+    registry.tag(camera_bp, 'camera')
 
     # Definiamo la posizione della fotocamera rispetto al veicolo
     # Posizionata sopra e leggermente dietro il veicolo, rivolta in avanti
@@ -65,6 +71,7 @@ def spawn_camera(world, vehicle):
 
     if camera:
         print("Fotocamera spawnata e attaccata al veicolo.")
+        registry.append(camera)
     else:
         print("Impossibile spawnare la fotocamera.")
 
@@ -97,8 +104,11 @@ def main():
     """
     Funzione principale per avviare il test della fotocamera.
     """
-    actor_list = []  # Lista per tenere traccia di tutti gli attori creati (veicolo, sensori)
+    registry = None  # Tiene traccia di tutti gli attori creati (veicolo, sensori), anche in caso di crash
     image_data = {'image': None}  # Dizionario per condividere l'immagine tra il callback e il main loop
+    # Il visualizzatore gira in un processo separato: imshow/waitKey non rallentano il ciclo di simulazione
+    visualizer = Visualizer(cameras={'Camera Feed CARLA': (IMG_HEIGHT, IMG_WIDTH, 3)}, fps=DISPLAY_FPS,
+                            output=VIDEO_OUTPUT, headless=HEADLESS)
 
     try:
         # --- 1. CONNESSIONE A CARLA ---
@@ -108,16 +118,18 @@ def main():
         world = client.get_world()
         print("Connessione riuscita!")
 
+        # Rimuove gli attori rimasti da esecuzioni precedenti terminate senza pulizia
+        registry = ActorRegistry(client, world)
+        registry.sweep_orphans()
+
         # --- 2. SPAWN DEGLI ATTORI ---
-        vehicle = spawn_vehicle(world)
+        vehicle = spawn_vehicle(world, registry)
         if vehicle is None:
             return
-        actor_list.append(vehicle)
 
-        camera = spawn_camera(world, vehicle)
+        camera = spawn_camera(world, vehicle, registry)
         if camera is None:
             return
-        actor_list.append(camera)
 
         # --- 3. AVVIO DEL SENSORE ---
         # Avviamo il sensore. Ogni nuova immagine chiamerà la funzione 'camera_callback'
@@ -125,20 +137,22 @@ def main():
         print("Sensore fotocamera attivo. In attesa di immagini...")
 
         # --- 4. CICLO PRINCIPALE DI VISUALIZZAZIONE ---
-        # Creiamo una finestra con OpenCV
-        cv2.namedWindow('Camera Feed CARLA', cv2.WINDOW_AUTOSIZE)
+        visualizer.start()
 
         print("\nPremi 'q' sulla finestra della fotocamera per chiudere.")
+        published = None  # Ultima immagine copiata nel visualizzatore (ogni callback crea un nuovo array)
         while True:
             # Avanza la simulazione. È FONDAMENTALE per generare nuovi dati dai sensori.
             world.tick()
 
-            # Controlla se un'immagine è stata catturata dal callback
-            if image_data['image'] is not None:
-                cv2.imshow('Camera Feed CARLA', image_data['image'])
+            # Pubblica solo un'immagine nuova: non blocca mai, se il visualizzatore è occupato si riprova al giro dopo
+            image = image_data['image']
+            if image is not None and image is not published:
+                if visualizer.publish_camera('Camera Feed CARLA', image):
+                    published = image
 
-            # Aspetta 1ms per un input da tastiera. Se 'q' è premuto, esci dal ciclo.
-            if cv2.waitKey(1) == ord('q'):
+            # Se 'q' è stato premuto nella finestra, esci dal ciclo.
+            if visualizer.should_close:
                 print("Tasto 'q' premuto. Chiusura in corso...")
                 break
 
@@ -149,12 +163,11 @@ def main():
         # --- 5. PULIZIA DEGLI ATTORI ---
         # Questo blocco viene eseguito sempre, sia in caso di errore che di uscita normale.
         print("Pulizia degli attori...")
-        cv2.destroyAllWindows()  # Chiude la finestra di OpenCV
+        visualizer.close()  # Chiude la finestra e completa il file video
 
-        for actor in actor_list:
-            if actor.is_alive:
-                print(f"Distruggendo: {actor.type_id}")
-                actor.destroy()
+        # Ferma i sensori e distrugge tutti gli attori della sessione con un'unica chiamata batch
+        if registry is not None:
+            registry.destroy_all()
 
         print("Script terminato.")
 
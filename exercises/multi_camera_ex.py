@@ -1,40 +1,47 @@
 import carla
-import cv2
-import numpy as np
-import random
-import time
 
 import utils.spawn_utils
 import utils.sensor_utils
+from utils.actor_registry import ActorRegistry
+from utils.governor import SensorGovernor
+from utils.rig import SensorRig
+from utils.visualizer import Visualizer
 
 
 # --- Costanti di configurazione ---
 HOST = 'localhost'
 PORT = 2000
 
+CAMERA_ATTRIBUTES = {'image_size_x': 800, 'image_size_y': 600, 'fov': 110, 'sensor_tick': 0.0}
 
-def main():
-    image_data = {'image': None}  # Dizionario per condividere l'immagine tra il callback e il main loop
-
-    all_camera_data = {'front': None, 'rear': None, 'left': None, 'right': None}  # Dizionario per condividere l'immagine tra il callback e il main loop
-    actor_list = []  # Lista per tenere traccia di tutti gli attori creati (veicolo, sensori)
+# Rig con le quattro fotocamere (x: avanti, y: destra, z: altezza, yaw in gradi)
+# Le fotocamere 'cosmetic' sono le prime a essere rallentate dal governor quando l'elaborazione è in ritardo
+CAMERA_RIG = {
+    'sensors': [
+        {'name': 'front', 'type': 'camera', 'pose': {'x': 1.5, 'z': 1.8, 'yaw': 0}, 'attributes': CAMERA_ATTRIBUTES},
+        {'name': 'rear', 'type': 'camera', 'pose': {'x': -1.5, 'z': 1.8, 'yaw': 180}, 'attributes': CAMERA_ATTRIBUTES,
+         'priority': 'cosmetic'},
+        {'name': 'left', 'type': 'camera', 'pose': {'x': -1.5, 'z': 1.8, 'yaw': 270}, 'attributes': CAMERA_ATTRIBUTES,
+         'priority': 'cosmetic'},
+        {'name': 'right', 'type': 'camera', 'pose': {'x': -1.5, 'z': 1.8, 'yaw': 90}, 'attributes': CAMERA_ATTRIBUTES,
+         'priority': 'cosmetic'},
+    ]
+}
 
-    front_location = carla.Location(x=1.5, y=0, z=1.8)  # x: avanti, y: centro, z: altezza
-    front_rotation = carla.Rotation(pitch=0, yaw=0, roll=0)  # dritta, rivolta in avanti
-    front_transform = carla.Transform(front_location, front_rotation)
+DISPLAY_FPS = 15  # Frequenza del mosaico, indipendente da world.tick()
+VIDEO_OUTPUT = None  # Es. 'multi_camera.mp4' per salvare il video (con HEADLESS = True nessuna finestra)
+HEADLESS = False
 
-    rear_location = carla.Location(x=-1.5, y=0, z=1.8)  # x: indietro
-    rear_rotation = carla.Rotation(pitch=0, yaw=180, roll=0)  # yaw di 180 gradi
-    rear_transform = carla.Transform(rear_location, rear_rotation)
 
-    left_location = carla.Location(x=-1.5, y=0, z=1.8)  # x: indietro
-    left_rotation = carla.Rotation(pitch=0, yaw=270, roll=0)  # yaw di 180 gradi
-    left_transform = carla.Transform(left_location, left_rotation)
-
-    right_location = carla.Location(x=-1.5, y=0, z=1.8)  # x: indietro
-    right_rotation = carla.Rotation(pitch=0, yaw=90, roll=0)  # yaw di 180 gradi
-    right_transform = carla.Transform(right_location, right_rotation)
+def main():
+    all_camera_data = {'front': None, 'rear': None, 'left': None, 'right': None}  # Dizionario per condividere l'immagine tra il callback e il main loop
+    registry = None  # Tiene traccia di tutti gli attori creati (veicolo, sensori), anche in caso di crash
 
+    rig = SensorRig.from_dict(CAMERA_RIG)
+    # Mosaico delle quattro fotocamere in un processo separato, alimentato tramite memoria condivisa
+    camera_shape = (CAMERA_ATTRIBUTES['image_size_y'], CAMERA_ATTRIBUTES['image_size_x'], 3)
+    visualizer = Visualizer(cameras={name: camera_shape for name in all_camera_data}, fps=DISPLAY_FPS,
+                            output=VIDEO_OUTPUT, headless=HEADLESS)
 
     try:
         #connect
@@ -44,58 +51,52 @@ def main():
         world = client.get_world()
         print("Connessione riuscita!")
 
+        # Rimuove gli attori rimasti da esecuzioni precedenti terminate senza pulizia
+        registry = ActorRegistry(client, world)
+        registry.sweep_orphans()
+
         #spawn actors
-        vehicle = utils.spawn_utils.spawn_vehicle(world)
+        vehicle = utils.spawn_utils.spawn_vehicle(world, registry=registry)
         if vehicle is None:
             return
-        actor_list.append(vehicle)
-
-        Frcamera = utils.spawn_utils.spawn_camera(world, vehicle, front_transform)
-        Recamera = utils.spawn_utils.spawn_camera(world, vehicle, rear_transform)
-        Lecamera = utils.spawn_utils.spawn_camera(world, vehicle, left_transform)
-        Ricamera = utils.spawn_utils.spawn_camera(world, vehicle, right_transform)
 
-        actor_list.append(Frcamera)
-        actor_list.append(Recamera)
-        actor_list.append(Lecamera)
-        actor_list.append(Ricamera)
+        # Spawniamo tutte le fotocamere del rig con un'unica chiamata batch
+        cameras = rig.spawn(client, world, vehicle, registry)
 
         #sensor
-        # Avviamo il sensore. Ogni nuova immagine chiamerà la funzione 'camera_callback'
-
-        Frcamera.listen(lambda image: utils.sensor_utils.camera_callback(image, all_camera_data, 'front'))
-        Recamera.listen(lambda image: utils.sensor_utils.camera_callback(image, all_camera_data, 'rear'))
-        Lecamera.listen(lambda image: utils.sensor_utils.camera_callback(image, all_camera_data, 'left'))
-        Ricamera.listen(lambda image: utils.sensor_utils.camera_callback(image, all_camera_data, 'right'))
+        # Avviamo i sensori tramite il governor: misura la latenza dei callback e adatta
+        # sensor_tick / risoluzione delle fotocamere. Ogni nuova immagine chiamerà 'camera_callback'
+        governor = SensorGovernor(world)
+        for name, camera in cameras.items():
+            if camera is not None:
+                governor.manage(name, camera, rig[name], vehicle,
+                                lambda image, name=name: utils.sensor_utils.camera_callback(image, all_camera_data, name),
+                                registry)
 
         print("Sensore fotocamera attivo. In attesa di immagini...")
 
-        # Creiamo una finestra con OpenCV
-        cv2.namedWindow('Front-Cam', cv2.WINDOW_NORMAL)
-        cv2.namedWindow('Rear-Cam', cv2.WINDOW_NORMAL)
-        cv2.namedWindow('Left-Cam', cv2.WINDOW_NORMAL)
-        cv2.namedWindow('Right-Cam', cv2.WINDOW_NORMAL)
+        visualizer.start()
 
         print("\nPremi 'q' sulla finestra della fotocamera per chiudere.")
+        published = {}  # Ultima immagine copiata nel visualizzatore per ogni fotocamera
         while True:
             # Avanza la simulazione. È FONDAMENTALE per generare nuovi dati dai sensori.
-            world.tick()
-
-            # Controlla se un'immagine è stata catturata dal callback
-            if all_camera_data['front'] is not None:
-                cv2.imshow('Front-Cam', all_camera_data['front'])
-            if all_camera_data['rear'] is not None:
-                cv2.imshow('Rear-Cam', all_camera_data['rear'])
-            if all_camera_data['left'] is not None:
-                cv2.imshow('Left-Cam', all_camera_data['left'])
-            if all_camera_data['right'] is not None:
-                cv2.imshow('Right-Cam', all_camera_data['right'])
-
-            # Aspetta 1ms per un input da tastiera. Se 'q' è premuto, esci dal ciclo.
-            if cv2.waitKey(1) == ord('q'):
+            frame = world.tick()
+            governor.update(frame)
+
+            # Pubblica solo le immagini nuove: non blocca mai, se il visualizzatore è occupato si riprova al giro dopo
+            for name, image in all_camera_data.items():
+                if image is not None and image is not published.get(name):
+                    if visualizer.publish_camera(name, image):
+                        published[name] = image
+
+            # Se 'q' è stato premuto nella finestra del mosaico, esci dal ciclo.
+            if visualizer.should_close:
                 print("Tasto 'q' premuto. Chiusura in corso...")
                 break
 
+        governor.report()
+
     except Exception as e:
         print(f"Si è verificato un errore: {e}")
 
@@ -103,12 +104,11 @@ def main():
         # --- 5. PULIZIA DEGLI ATTORI ---
         # Questo blocco viene eseguito sempre, sia in caso di errore che di uscita normale.
         print("Pulizia degli attori...")
-        cv2.destroyAllWindows()  # Chiude la finestra di OpenCV
+        visualizer.close()  # Chiude la finestra e completa il file video
 
-        for actor in actor_list:
-            if actor.is_alive:
-                print(f"Distruggendo: {actor.type_id}")
-                actor.destroy()
+        # Ferma i sensori e distrugge tutti gli attori della sessione con un'unica chiamata batch
+        if registry is not None:
+            registry.destroy_all()
 
         print("Script terminato.")
 
@@ -0,0 +1,6 @@
+"""Shared helpers for the CARLA lab scripts.
+
+Submodules are imported explicitly (``import utils.sensor_utils``) and keep
+heavy backends such as ``carla``, ``cv2`` and ``pygame`` lazy, so headless
+sensor workers only pay for what they actually use.
+"""
@@ -0,0 +1,250 @@
+"""
+Crash-safe registry of the actors spawned by a script.
+
+Every blueprint is tagged before spawning with a ``role_name`` of the form
+``svs:<host>.<pid>.<token>:<role>``. If a script dies before its cleanup
+runs, the actors it leaked keep that tag, so the next session can find them
+with a single ``world.get_actors()`` and remove them in one DestroyActor
+batch. Only sessions whose owner process is provably dead (same host, pid
+no longer running) are swept: other scripts connected to the same server
+keep their actors. Sensors are always stopped before they are destroyed, so
+they stop streaming to clients that no longer exist.
+
+    registry = ActorRegistry(client, world)
+    registry.sweep_orphans()
+    try:
+        bp = registry.tag(blueprint_library.find('sensor.other.radar'), 'radar')
+        registry.append(world.spawn_actor(bp, transform, attach_to=vehicle))
+        ...
+    finally:
+        registry.destroy_all()
+
+The ego vehicle can be tagged with role 'hero': its role_name is then
+exactly 'hero', as the Traffic Manager (hybrid physics) and large maps
+require. Orphan heroes are recognised through the orphan sensors attached to
+them: ``anchor_hero`` attaches a session-tagged collision sensor right after
+the hero spawns, so a crash before any other sensor is mounted does not leak
+it.
+
+The registry also behaves like the plain ``actor_list`` the scripts used
+before (append, remove, iteration, len).
+"""
+
+import collections
+import ctypes
+import os
+import socket
+import time
+import uuid
+
+from utils.lazy import lazy_import
+
+carla = lazy_import('carla')
+
+ROLE_PREFIX = 'svs'
+HERO_ROLE = 'hero'
+# ':' separates the fields of a tag, '.' is fine (session_owner splits from the right)
+_HOST = socket.gethostname().replace(':', '-')
+
+TeardownReport = collections.namedtuple('TeardownReport', ['destroyed', 'failed', 'leaked', 'seconds'])
+
+
+def parse_role_name(role_name):
+    """Returns (session, role) for a registry tag, or None for any other role_name"""
+    parts = role_name.split(':', 2)
+    if len(parts) != 3 or parts[0] != ROLE_PREFIX:
+        return None
+    return parts[1], parts[2]
+
+
+def session_owner(session):
+    """Returns (host, pid) of the process that created a session, or None if the id has no owner"""
+    parts = session.rsplit('.', 2)
+    if len(parts) != 3 or not parts[1].isdigit():
+        return None
+    return parts[0], int(parts[1])
+
+
+def _pid_alive(pid):
+    if os.name == 'nt':
+        # os.kill(pid, 0) would terminate the process on Windows
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return ctypes.get_last_error() == 5  # ERROR_ACCESS_DENIED: exists, owned by someone else
+        exit_code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        kernel32.CloseHandle(handle)
+        return exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def session_is_dead(session):
+    """
+    True only if the session's owner process has provably exited.
+
+    Sessions created on another host (or without an owner in their id) can not
+    be checked from here and count as alive.
+    """
+    owner = session_owner(session)
+    if owner is None:
+        return False
+    host, pid = owner
+    if host != _HOST or pid == os.getpid():
+        return False
+    return not _pid_alive(pid)
+
+
+def _is_sensor(actor):
+    return actor.type_id.startswith('sensor.')
+
+
+class ActorRegistry:
+    """Tracks, tags and tears down the actors of one session"""
+
+    def __init__(self, client, world, session=None, verbose=True):
+        """
+        Args:
+            session (str): optional token; the session id is always prefixed with host and pid,
+                so orphan sweeps can tell whether the owner is still running.
+        """
+        self.client = client
+        self.world = world
+        self.session = f"{_HOST}.{os.getpid()}.{session or uuid.uuid4().hex[:8]}"
+        self.verbose = verbose
+        self._actors = []
+
+    def role_name(self, role='actor'):
+        return f"{ROLE_PREFIX}:{self.session}:{role}"
+
+    def tag(self, blueprint, role='actor'):
+        """Sets the session role_name on a blueprint (before spawning) and returns it"""
+        if blueprint.has_attribute('role_name'):
+            blueprint.set_attribute('role_name', HERO_ROLE if role == HERO_ROLE else self.role_name(role))
+        return blueprint
+
+    def anchor_hero(self, hero):
+        """
+        Attaches a session-tagged (idle) collision sensor to a 'hero' vehicle.
+
+        The hero's role_name can not carry the session, so the anchor is what lets
+        the sweep of a later session recognise it as an orphan.
+
+        Returns:
+            carla.Actor: the anchor sensor, or None if it could not be spawned.
+        """
+        blueprint = self.tag(self.world.get_blueprint_library().find('sensor.other.collision'), 'hero_anchor')
+        return self.append(self.world.try_spawn_actor(blueprint, carla.Transform(), attach_to=hero))
+
+    def append(self, actor):
+        """Registers a spawned actor (None is ignored, so failed spawns can be passed directly)"""
+        if actor is not None:
+            self._actors.append(actor)
+        return actor
+
+    def remove(self, actor):
+        self._actors.remove(actor)
+
+    def __contains__(self, actor):
+        return actor in self._actors
+
+    def __iter__(self):
+        return iter(list(self._actors))
+
+    def __len__(self):
+        return len(self._actors)
+
+    def destroy(self, actors):
+        """
+        Stops sensors, destroys ``actors`` in one batch and stops tracking them.
+
+        Returns:
+            TeardownReport: actors destroyed, failed and still alive, and the time it took.
+        """
+        actors = list(actors)
+        ids = {actor.id for actor in actors}
+        self._actors = [actor for actor in self._actors if actor.id not in ids]
+        return self._destroy(actors)
+
+    def _destroy(self, actors):
+        """Stops sensors, destroys everything in one batch and counts what is still alive"""
+        start = time.perf_counter()
+        for actor in actors:
+            if _is_sensor(actor):
+                try:
+                    actor.stop()
+                except RuntimeError:
+                    pass  # already destroyed server-side
+
+        ids = [actor.id for actor in actors]
+        if not ids:
+            return TeardownReport(0, 0, 0, time.perf_counter() - start)
+
+        # In synchronous mode the batch ticks the world, otherwise wait for the next tick:
+        # either way get_actors() below reads a snapshot taken after the destruction
+        synchronous = self.world.get_settings().synchronous_mode
+        responses = self.client.apply_batch_sync([carla.command.DestroyActor(actor_id) for actor_id in ids], synchronous)
+        if not synchronous:
+            self.world.wait_for_tick()
+        failed = sum(1 for response in responses if response.error)
+        leaked = len(self.world.get_actors(ids))
+        return TeardownReport(len(ids) - failed, failed, leaked, time.perf_counter() - start)
+
+    def sweep_orphans(self):
+        """
+        Removes actors tagged by earlier sessions that never cleaned up.
+
+        Sessions of scripts that are still running (or whose owner can not be
+        checked, e.g. started on another host) are left alone.
+
+        Returns:
+            TeardownReport: orphans destroyed, failed and still alive, and the time it took.
+        """
+        orphans = []
+        heroes = {}
+        dead = {}  # session -> owner exited, checked once per session
+        live_sessions = set()
+        for actor in self.world.get_actors():
+            role_name = actor.attributes.get('role_name', '')
+            tag = parse_role_name(role_name)
+            if tag is not None and tag[0] != self.session:
+                if tag[0] not in dead:
+                    dead[tag[0]] = session_is_dead(tag[0])
+                if dead[tag[0]]:
+                    orphans.append(actor)
+                else:
+                    live_sessions.add(tag[0])
+            elif role_name == HERO_ROLE and actor not in self._actors:
+                heroes[actor.id] = actor
+
+        # A hero is only ours to remove if orphan sensors of an earlier session are attached to it
+        parent_ids = {actor.parent.id for actor in orphans if actor.parent is not None}
+        orphans.extend(hero for hero_id, hero in heroes.items() if hero_id in parent_ids)
+
+        report = self._destroy(orphans)
+        if self.verbose:
+            print(f"Orphan sweep: {report.destroyed} destroyed, {report.failed} failed, "
+                  f"{report.leaked} still alive ({report.seconds * 1000:.1f} ms), "
+                  f"{len(live_sessions)} other session(s) left alone (running or not checkable)")
+        return report
+
+    def destroy_all(self):
+        """
+        Tears down every registered actor (sensors stopped first) in one batch.
+
+        Returns:
+            TeardownReport: actors destroyed, failed and leaked, and the time it took.
+        """
+        actors = [actor for actor in self._actors if actor.is_alive]
+        report = self._destroy(actors)
+        self._actors = []
+        if self.verbose:
+            print(f"Teardown: {report.destroyed} destroyed, {report.failed} failed, "
+                  f"{report.leaked} leaked ({report.seconds * 1000:.1f} ms)")
+        return report
@@ -0,0 +1,188 @@
+"""
+Monocular Time To Collision from image scale change (CPU only).
+
+For an object approaching at constant speed, its image grows by a factor
+s = Z(t - dt) / Z(t) between two frames, so TTC = dt / (s - 1). The
+expansion is only measured on the lead vehicle: its image region comes from
+the nearest in-path radar return, projected into the camera with the rig
+extrinsics and the pinhole intrinsics given by the camera fov. Without an
+in-path return there is no lead vehicle and the TTC is inf, so the scene
+expanding because of the ego's own motion is never reported as a collision.
+
+Inside that region corner features are tracked with pyramidal Lucas-Kanade
+optical flow and a similarity transform (RANSAC) gives s.
+
+    intrinsics = camera_intrinsics(800, 600, 90)
+    ego_to_camera = np.linalg.inv(rig.extrinsics[rig.index('front_camera')])
+    roi = lead_vehicle_roi(points, in_path, ego_to_camera, intrinsics, (800, 600))
+    ttc = estimator.update(bgra_image, image.timestamp, roi)
+"""
+
+import numpy as np
+
+from utils.lazy import lazy_import
+
+cv2 = lazy_import('cv2')
+
+# Rear face of the lead vehicle around its radar return, in the ego frame (origin on the ground)
+VEHICLE_HALF_WIDTH = 0.9  # meters
+VEHICLE_BOTTOM = 0.3  # meters above the ground
+VEHICLE_TOP = 1.5  # meters above the ground
+MIN_DEPTH = 1.0  # meters in front of the camera, closer boxes are not projected
+
+
+def camera_intrinsics(width, height, fov):
+    """Pinhole matrix of a CARLA camera (square pixels, principal point at the image centre)"""
+    focal = width / (2.0 * np.tan(np.radians(fov) / 2.0))
+    return np.array([[focal, 0.0, width / 2.0],
+                     [0.0, focal, height / 2.0],
+                     [0.0, 0.0, 1.0]])
+
+
+def lead_vehicle_roi(points, in_path, ego_to_camera, intrinsics, image_size,
+                     half_width=VEHICLE_HALF_WIDTH, bottom=VEHICLE_BOTTOM, top=VEHICLE_TOP):
+    """
+    Image box of the lead vehicle, seeded by the nearest in-path radar return.
+
+    Args:
+        points (np.ndarray): (N, >=3) ego-frame radar points (utils.radar layout).
+        in_path (np.ndarray): (N,) bool mask of the returns inside the ego lane.
+        ego_to_camera (np.ndarray): 4x4 ego-to-camera matrix (inverse of the camera extrinsic).
+        intrinsics (np.ndarray): 3x3 camera_intrinsics.
+        image_size (tuple): (width, height) in pixels.
+
+    Returns:
+        tuple or None: (x0, y0, x1, y1) pixels, None when there is no in-path return in view.
+    """
+    if points is None or not np.any(in_path):
+        return None
+    candidates = points[in_path]
+    lead = candidates[np.argmin(candidates[:, 0])]
+    x, y = lead[0], lead[1]
+    corners = np.array([[x, y - half_width, bottom, 1.0],
+                        [x, y + half_width, bottom, 1.0],
+                        [x, y - half_width, top, 1.0],
+                        [x, y + half_width, top, 1.0]])
+    camera = corners @ ego_to_camera.T
+    depth = camera[:, 0]
+    if np.any(depth < MIN_DEPTH):
+        return None
+
+    # CARLA camera axes (x forward, y right, z up) -> image axes (right, down, depth)
+    pixels = np.stack((camera[:, 1], -camera[:, 2], depth), axis=1) @ intrinsics.T
+    u, v = pixels[:, 0] / depth, pixels[:, 1] / depth
+    width, height = image_size
+    x0, x1 = max(0, int(u.min())), min(width, int(np.ceil(u.max())))
+    y0, y1 = max(0, int(v.min())), min(height, int(np.ceil(v.max())))
+    if x1 - x0 < 4 or y1 - y0 < 4:
+        return None
+    return x0, y0, x1, y1
+
+
+def _to_gray(image):
+    if image.ndim == 2:
+        return image
+    code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(image, code)
+
+
+class ScaleTTCEstimator:
+    """Tracks the expansion of the lead vehicle region between consecutive frames"""
+
+    def __init__(self, max_patch=160, margin=0.25, max_features=60, min_features=6,
+                 smoothing=0.5, min_expansion=0.05):
+        """
+        Args:
+            max_patch (int): the analysed window is shrunk until it is at most this wide (pixels).
+            margin (float): window margin around the lead vehicle boxes, as a fraction of their size.
+            max_features (int): corners detected on the lead vehicle per frame pair.
+            min_features (int): fewer corners than this and the frame pair is not measured.
+            smoothing (float): EWMA weight of the newest expansion rate (1.0 = no smoothing).
+            min_expansion (float): expansion rate [1/s] below which TTC is reported as inf
+                (0.05 = nothing beyond 20 s).
+        """
+        self.max_patch = max_patch
+        self.margin = margin
+        self.max_features = max_features
+        self.min_features = min_features
+        self.smoothing = smoothing
+        self.min_expansion = min_expansion
+        self.reset()
+
+    def reset(self):
+        self._prev_gray = None
+        self._prev_roi = None
+        self._prev_time = None
+        self.expansion_rate = None  # smoothed (s - 1) / dt [1/s], None until the first measurement
+        self.ttc = float('inf')
+
+    def _window(self, shape, prev_roi, roi):
+        """Window covering both boxes plus a margin, and the shrink factor that keeps it small"""
+        x0, y0 = min(prev_roi[0], roi[0]), min(prev_roi[1], roi[1])
+        x1, y1 = max(prev_roi[2], roi[2]), max(prev_roi[3], roi[3])
+        mx, my = int(self.margin * (x1 - x0)) + 1, int(self.margin * (y1 - y0)) + 1
+        height, width = shape
+        x0, y0, x1, y1 = max(0, x0 - mx), max(0, y0 - my), min(width, x1 + mx), min(height, y1 + my)
+        factor = max(1, -(-(x1 - x0) // self.max_patch))
+        return (x0, y0, x1, y1), factor
+
+    def _measure_scale(self, prev_gray, gray, prev_roi, roi):
+        (x0, y0, x1, y1), factor = self._window(gray.shape, prev_roi, roi)
+        prev_patch, patch = prev_gray[y0:y1, x0:x1], gray[y0:y1, x0:x1]
+        if factor > 1:
+            size = ((x1 - x0) // factor, (y1 - y0) // factor)
+            prev_patch = cv2.resize(prev_patch, size, interpolation=cv2.INTER_AREA)
+            patch = cv2.resize(patch, size, interpolation=cv2.INTER_AREA)
+
+        # Corners only on the lead vehicle of the previous frame
+        mask = np.zeros(prev_patch.shape, dtype=np.uint8)
+        mask[(prev_roi[1] - y0) // factor:(prev_roi[3] - y0) // factor,
+             (prev_roi[0] - x0) // factor:(prev_roi[2] - x0) // factor] = 255
+        points = cv2.goodFeaturesToTrack(prev_patch, self.max_features, 0.01, 2, mask=mask)
+        if points is None or len(points) < self.min_features:
+            return None
+
+        tracked, status, _ = cv2.calcOpticalFlowPyrLK(prev_patch, patch, points, None,
+                                                      winSize=(11, 11), maxLevel=2)
+        ok = status.ravel() == 1
+        if ok.sum() < self.min_features:
+            return None
+        matrix, _ = cv2.estimateAffinePartial2D(points[ok], tracked[ok], method=cv2.RANSAC,
+                                                ransacReprojThreshold=0.5)
+        if matrix is None:
+            return None
+        return float(np.hypot(matrix[0, 0], matrix[1, 0]))
+
+    def update(self, image, timestamp, roi):
+        """
+        Processes one frame.
+
+        Args:
+            image (np.ndarray): HxWx4 (BGRA, as in carla.Image.raw_data), HxWx3 or grayscale.
+            timestamp (float): frame time in seconds (carla.Image.timestamp).
+            roi (tuple): lead vehicle box (lead_vehicle_roi), None when there is no lead vehicle.
+
+        Returns:
+            float: smoothed TTC in seconds, inf when there is no lead vehicle or it is not approaching.
+        """
+        if roi is None:
+            self.reset()
+            return self.ttc
+
+        gray = _to_gray(image)
+        prev_gray, prev_roi, prev_time = self._prev_gray, self._prev_roi, self._prev_time
+        self._prev_gray, self._prev_roi, self._prev_time = gray, roi, timestamp
+        if prev_gray is None or timestamp <= prev_time:
+            return self.ttc
+
+        scale = self._measure_scale(prev_gray, gray, prev_roi, roi)
+        if scale is None:
+            return self.ttc
+
+        rate = (scale - 1.0) / (timestamp - prev_time)
+        if self.expansion_rate is None:
+            self.expansion_rate = rate
+        else:
+            self.expansion_rate += self.smoothing * (rate - self.expansion_rate)
+        self.ttc = 1.0 / self.expansion_rate if self.expansion_rate > self.min_expansion else float('inf')
+        return self.ttc
@@ -0,0 +1,282 @@
+"""
+Adaptive sensor rate and resolution governor.
+
+Every managed sensor's callback is instrumented to measure its processing
+latency and how many world frames it lags behind. Periodically the governor
+compares the total callback load with a CPU budget:
+
+- overloaded (load above budget, or a sensor lagging more than ``max_lag``
+  frames): the lowest-priority sensor that can still be slowed down drops one
+  level (higher ``sensor_tick``, fewer ``points_per_second``, smaller images);
+- headroom (load below ``low_watermark`` and no lag): the highest-priority
+  degraded sensor gets one level back.
+
+Cosmetic sensors are degraded first and restored last, 'critical' sensors
+(the EBS radar) always run at their configured rate. CARLA cannot change
+blueprint attributes of a live sensor, so a level change respawns it with the
+same pose, parent and callback.
+"""
+
+import collections
+import math
+import time
+
+RateDecision = collections.namedtuple(
+    'RateDecision', ['time', 'sensor', 'action', 'level', 'attributes', 'load', 'reason'])
+
+# Order in which sensors are degraded (first) and restored (last)
+SHED_ORDER = {'cosmetic': 0, 'normal': 1}
+
+DEFAULT_POINTS_PER_SECOND = {'lidar': 56000, 'radar': 1500}
+DEFAULT_CAMERA_PERIOD = 0.05  # seconds, assumed frame period of a camera with sensor_tick 0 in a variable-step world
+
+# Camera levels: (frame period as a multiple of the configured one, image downscale factor)
+CAMERA_STEPS = ((2, 1), (2, 2), (4, 2))
+
+
+def _effective_period(tick, world_step):
+    """A sensor fires on the first world step at or after its sensor_tick, so its period is a whole number of steps"""
+    if not world_step:
+        return tick
+    return max(1, math.ceil(tick / world_step - 1e-9)) * world_step
+
+
+def rate_levels(spec, world_step=None):
+    """
+    Attribute overrides for each level of a sensor, level 0 being its configured rate.
+
+    Args:
+        world_step (float): fixed_delta_seconds of the world (None for variable steps). Camera
+            ticks are multiples of the effective configured period, so every level sheds load
+            even when the world step is longer than the configured sensor_tick.
+
+    Returns:
+        list: dicts of blueprint attributes, from full rate to the lowest allowed rate.
+    """
+    if spec.priority == 'critical':
+        return [{}]
+
+    attributes = spec.attributes
+    blueprint_id = spec.blueprint_id
+    if blueprint_id.startswith('sensor.camera'):
+        base_tick = float(attributes.get('sensor_tick', 0.0))
+        width = int(attributes.get('image_size_x', 800))
+        height = int(attributes.get('image_size_y', 600))
+        base_period = _effective_period(base_tick, world_step) or world_step or DEFAULT_CAMERA_PERIOD
+        levels = [{}]
+        for factor, scale in CAMERA_STEPS:
+            level = {'sensor_tick': round(base_period * factor, 6)}
+            if scale > 1:
+                level['image_size_x'] = width // scale
+                level['image_size_y'] = height // scale
+            levels.append(level)
+        return levels
+
+    for kind in ('lidar', 'radar'):
+        if kind in blueprint_id:
+            base_pps = int(float(attributes.get('points_per_second', DEFAULT_POINTS_PER_SECOND[kind])))
+            levels = [{}]
+            for factor in (0.5, 0.25):
+                pps = int(base_pps * factor)
+                if pps > 0 and pps != levels[-1].get('points_per_second', base_pps):
+                    levels.append({'points_per_second': pps})
+            return levels
+    return [{}]
+
+
+class _ManagedSensor:
+    """Runtime state of one governed sensor"""
+
+    def __init__(self, name, actor, spec, parent, callback, registry, world_step=None):
+        self.name = name
+        self.actor = actor
+        self.spec = spec
+        self.parent = parent
+        self.callback = callback
+        self.registry = registry
+        self.levels = rate_levels(spec, world_step)
+        self.level = 0
+        self.reset()
+
+    def reset(self):
+        self.latency = 0.0  # EWMA of callback processing time [s]
+        self.interval = 0.0  # EWMA of wall time between callbacks [s]
+        self.lag = 0  # max world frames behind since the last decision
+        self.calls = 0
+        self.last_call = None
+
+    @property
+    def load(self):
+        """Fraction of one core spent in the callback"""
+        if self.calls < 2 or self.interval <= 0.0:
+            return 0.0
+        return self.latency / self.interval
+
+
+class SensorGovernor:
+    """Watches sensor callbacks and adapts their rate/resolution to the CPU budget"""
+
+    def __init__(self, world, cpu_budget=0.8, low_watermark=0.4, max_lag=2,
+                 interval=2.0, alpha=0.2, verbose=True):
+        """
+        Args:
+            cpu_budget (float): total callback load (cores) above which sensors are slowed down.
+            low_watermark (float): total load below which degraded sensors are restored.
+            max_lag (int): world frames a sensor may lag behind before it counts as overloaded.
+            interval (float): seconds between two decisions (also the settle time after a change).
+            alpha (float): EWMA smoothing factor of latency and arrival interval.
+        """
+        self.world = world
+        self.cpu_budget = cpu_budget
+        self.low_watermark = low_watermark
+        self.max_lag = max_lag
+        self.interval = interval
+        self.alpha = alpha
+        self.verbose = verbose
+        self.decisions = []
+        self._sensors = collections.OrderedDict()
+        self._world_frame = None
+        self._next_decision = time.perf_counter() + interval
+        self._start = time.perf_counter()
+
+    def manage(self, name, actor, spec, parent, callback, registry=None):
+        """
+        Puts a spawned sensor under governor control and starts listening.
+
+        Args:
+            spec (utils.rig.SensorSpec): used to respawn the sensor with other attributes.
+            callback: the usual ``callback(data)`` function.
+            registry (utils.actor_registry.ActorRegistry): optional, kept in sync on respawn.
+        """
+        world_step = self.world.get_settings().fixed_delta_seconds
+        managed = _ManagedSensor(name, actor, spec, parent, callback, registry, world_step)
+        self._sensors[name] = managed
+        actor.listen(self._instrument(managed))
+        return managed
+
+    def _instrument(self, managed):
+        def instrumented(data):
+            start = time.perf_counter()
+            if managed.last_call is not None:
+                managed.interval = self._ewma(managed.interval, start - managed.last_call)
+            managed.last_call = start
+            if self._world_frame is not None:
+                managed.lag = max(managed.lag, self._world_frame - data.frame)
+
+            managed.callback(data)
+
+            managed.latency = self._ewma(managed.latency, time.perf_counter() - start)
+            managed.calls += 1
+        return instrumented
+
+    def _ewma(self, average, sample):
+        if average == 0.0:
+            return sample
+        return average + self.alpha * (sample - average)
+
+    @property
+    def load(self):
+        return sum(managed.load for managed in self._sensors.values())
+
+    def update(self, frame=None):
+        """
+        Call once per control-loop iteration (e.g. with the frame id returned by world.tick()).
+
+        Returns:
+            RateDecision or None: the decision taken at this call, if any.
+        """
+        if frame is not None:
+            self._world_frame = frame
+        now = time.perf_counter()
+        if now < self._next_decision:
+            return None
+        self._next_decision = now + self.interval
+
+        decision = self._decide(now)
+        for managed in self._sensors.values():
+            managed.lag = 0
+        return decision
+
+    def _decide(self, now):
+        load = self.load
+        lagging = [m for m in self._sensors.values() if m.lag > self.max_lag]
+
+        if load > self.cpu_budget or lagging:
+            candidates = [m for m in self._sensors.values()
+                          if m.spec.priority in SHED_ORDER and m.level < len(m.levels) - 1]
+            if not candidates:
+                return None
+            # Cosmetic first, then the sensor that costs the most
+            target = min(candidates, key=lambda m: (SHED_ORDER[m.spec.priority], -m.load))
+            if load > self.cpu_budget:
+                reason = f"load {load:.2f} > budget {self.cpu_budget:.2f}"
+            else:
+                reason = "lag " + ", ".join(f"{m.name}={m.lag}" for m in lagging) + " frames"
+            return self._change(target, target.level + 1, 'degrade', load, reason, now)
+
+        if load < self.low_watermark:
+            candidates = [m for m in self._sensors.values() if m.level > 0]
+            if not candidates:
+                return None
+            # Most important sensors get their rate back first
+            target = max(candidates, key=lambda m: SHED_ORDER[m.spec.priority])
+            reason = f"load {load:.2f} < {self.low_watermark:.2f}"
+            return self._change(target, target.level - 1, 'restore', load, reason, now)
+        return None
+
+    def _change(self, managed, level, action, load, reason, now):
+        attributes = managed.levels[level]
+        if not self._respawn(managed, attributes):
+            # The old sensor keeps streaming at its current level
+            decision = RateDecision(now - self._start, managed.name, 'failed', managed.level, attributes, load,
+                                    f"{action} to level {level} failed: sensor could not be spawned")
+            self.decisions.append(decision)
+            if self.verbose:
+                print(f"[governor] {action} {managed.name} -> level {level} failed, keeping level {managed.level}")
+            return decision
+        managed.level = level
+        # Let the new rate settle before it is judged again
+        for other in self._sensors.values():
+            other.reset()
+
+        decision = RateDecision(now - self._start, managed.name, action, level, attributes, load, reason)
+        self.decisions.append(decision)
+        if self.verbose:
+            print(f"[governor] {action} {managed.name} -> level {level} {attributes or '(configured rate)'}: {reason}")
+        return decision
+
+    def _respawn(self, managed, attributes):
+        """Replaces the sensor with one using ``attributes``; returns False (old sensor untouched) on failure"""
+        # Spawn first: if it fails the old sensor keeps streaming untouched
+        blueprint = managed.spec.blueprint(self.world.get_blueprint_library(), attributes)
+        if managed.registry is not None:
+            managed.registry.tag(blueprint, managed.spec.name)
+        actor = self.world.try_spawn_actor(blueprint, managed.spec.transform(), attach_to=managed.parent)
+        if actor is None:
+            return False
+        old = managed.actor
+        old.stop()
+        old.destroy()
+        if managed.registry is not None:
+            if old in managed.registry:
+                managed.registry.remove(old)
+            managed.registry.append(actor)
+        managed.actor = actor
+        actor.listen(self._instrument(managed))
+        return True
+
+    def actor(self, name):
+        """Current actor of a managed sensor (changes after every respawn)"""
+        return self._sensors[name].actor
+
+    def report(self):
+        """Prints every rate decision and the final level of each sensor"""
+        print("\nSensor governor report")
+        if not self.decisions:
+            print("  no rate changes")
+        for d in self.decisions:
+            print(f"  t={d.time:7.1f}s  {d.action:<8} {d.sensor:<12} level {d.level}  "
+                  f"{d.attributes or '(configured rate)'}  [{d.reason}]")
+        for managed in self._sensors.values():
+            print(f"  {managed.name:<12} priority={managed.spec.priority:<8} level={managed.level}/"
+                  f"{len(managed.levels) - 1}  load={managed.load:.3f}")
@@ -0,0 +1,82 @@
+"""Deferred imports for heavy or optional backends (carla, cv2, pygame)."""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+# Serialises the first real import of every lazy backend. importlib.util.LazyLoader
+# is not thread-safe before Python 3.12: a second thread could see a half-executed
+# module (e.g. cv2 without 'resize') while sensor callbacks and render threads race.
+_import_lock = threading.Lock()
+_proxies = {}
+
+
+class _MissingModule:
+    """Placeholder for a backend that is not installed.
+
+    Importing it never fails; the ImportError is raised on first use, so a
+    headless worker can import modules that only *optionally* need the backend.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        raise ImportError(f"'{self._name}' is required for this feature but is not installed")
+
+    def __bool__(self):
+        return False
+
+
+class _LazyModule(types.ModuleType):
+    """Stands in for a module until the first attribute access imports it for real"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+
+    def _load(self):
+        with _import_lock:
+            module = self.__dict__['_lazy_target']
+            if module is None:
+                # import_module also holds the per-module import lock, so other threads
+                # importing the backend directly never see it half-initialised either.
+                module = importlib.import_module(self.__name__)
+                self.__dict__['_lazy_target'] = module
+        return module
+
+    def __getattr__(self, attr):
+        module = self.__dict__['_lazy_target'] or self._load()
+        return getattr(module, attr)
+
+    def __dir__(self):
+        return dir(self.__dict__['_lazy_target'] or self._load())
+
+
+def lazy_import(name):
+    """Return module ``name`` without executing it until an attribute is accessed.
+
+    The first access imports the real module under a lock, so it is safe from
+    sensor callback and render threads.
+
+    Returns:
+        module: the real module if already imported, a lazy proxy, or a placeholder
+        that raises ImportError on use if the backend is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    with _import_lock:
+        proxy = _proxies.get(name)
+        if proxy is None:
+            if importlib.util.find_spec(name) is None:
+                return _MissingModule(name)
+            proxy = _proxies[name] = _LazyModule(name)
+    return proxy
+
+
+def is_loaded(name):
+    """True if ``name`` has really been executed (not just requested lazily)."""
+    return name in sys.modules
@@ -0,0 +1,260 @@
+"""
+Declarative sensor rig.
+
+A rig is a plain dict (or a YAML/TOML/JSON file with the same layout) that
+lists every sensor mounted on the ego vehicle:
+
+    RIG = {
+        'sensors': [
+            {'name': 'front', 'type': 'camera',
+             'pose': {'x': 1.5, 'z': 1.8},
+             'attributes': {'image_size_x': 800, 'image_size_y': 600, 'fov': 110}},
+            {'name': 'front_radar', 'type': 'radar',
+             'pose': {'x': 2.5, 'z': 1.0},
+             'attributes': {'range': 50, 'horizontal_fov': 45},
+             'priority': 'critical'},
+        ]
+    }
+
+Poses use CARLA conventions: meters for x/y/z, degrees for roll/pitch/yaw.
+``priority`` ('critical', 'normal' or 'cosmetic', default 'normal') tells
+utils.governor which sensors may be slowed down under load.
+
+The whole rig is spawned with a single batch command, and every
+sensor-to-ego transform is precomputed as a stacked (N, 4, 4) matrix so that
+data from many sensors can be moved into the ego frame in one vectorized
+operation.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from utils.lazy import lazy_import
+
+carla = lazy_import('carla')
+
+# Short names accepted in the 'type' field. A full blueprint id is accepted too.
+SENSOR_BLUEPRINTS = {
+    'camera': 'sensor.camera.rgb',
+    'lidar': 'sensor.lidar.ray_cast',
+    'semantic_lidar': 'sensor.lidar.ray_cast_semantic',
+    'radar': 'sensor.other.radar',
+}
+
+POSE_KEYS = ('x', 'y', 'z', 'roll', 'pitch', 'yaw')
+PRIORITIES = ('critical', 'normal', 'cosmetic')
+
+
+def pose_to_matrix(poses):
+    """
+    Converts poses to homogeneous sensor-to-parent matrices.
+
+    Same convention as carla.Transform.get_matrix().
+
+    Args:
+        poses (np.ndarray): (N, 6) array of [x, y, z, roll, pitch, yaw], angles in degrees.
+
+    Returns:
+        np.ndarray: (N, 4, 4) float64 matrices.
+    """
+    poses = np.atleast_2d(np.asarray(poses, dtype=np.float64))
+    roll, pitch, yaw = np.radians(poses[:, 3:6]).T
+    cr, sr = np.cos(roll), np.sin(roll)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+
+    matrix = np.zeros((poses.shape[0], 4, 4))
+    matrix[:, 0, 0] = cp * cy
+    matrix[:, 0, 1] = cy * sp * sr - sy * cr
+    matrix[:, 0, 2] = -cy * sp * cr - sy * sr
+    matrix[:, 1, 0] = cp * sy
+    matrix[:, 1, 1] = sy * sp * sr + cy * cr
+    matrix[:, 1, 2] = -sy * sp * cr + cy * sr
+    matrix[:, 2, 0] = sp
+    matrix[:, 2, 1] = -cp * sr
+    matrix[:, 2, 2] = cp * cr
+    matrix[:, :3, 3] = poses[:, :3]
+    matrix[:, 3, 3] = 1.0
+    return matrix
+
+
+class SensorSpec:
+    """One sensor of the rig: blueprint, attributes and mounting pose"""
+
+    def __init__(self, name, sensor_type, pose=None, attributes=None, priority='normal'):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}' for sensor {name}, expected one of {PRIORITIES}")
+        self.name = name
+        self.sensor_type = sensor_type
+        self.pose = {key: float((pose or {}).get(key, 0.0)) for key in POSE_KEYS}
+        self.attributes = {key: str(value) for key, value in (attributes or {}).items()}
+        self.priority = priority
+
+    @property
+    def blueprint_id(self):
+        return SENSOR_BLUEPRINTS.get(self.sensor_type, self.sensor_type)
+
+    def pose_vector(self):
+        return [self.pose[key] for key in POSE_KEYS]
+
+    def transform(self):
+        """Mounting pose as a carla.Transform relative to the parent actor"""
+        return carla.Transform(
+            carla.Location(x=self.pose['x'], y=self.pose['y'], z=self.pose['z']),
+            carla.Rotation(pitch=self.pose['pitch'], yaw=self.pose['yaw'], roll=self.pose['roll'])
+        )
+
+    def blueprint(self, blueprint_library, overrides=None):
+        """Finds the blueprint and applies the configured attributes (plus optional overrides)"""
+        blueprint = blueprint_library.find(self.blueprint_id)
+        attributes = dict(self.attributes)
+        attributes.update({key: str(value) for key, value in (overrides or {}).items()})
+        for key, value in attributes.items():
+            blueprint.set_attribute(key, value)
+        return blueprint
+
+
+class SensorRig:
+    """Set of sensors mounted on one parent actor, with precomputed extrinsics"""
+
+    def __init__(self, sensors):
+        self.sensors = list(sensors)
+        names = [spec.name for spec in self.sensors]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Sensor names must be unique, got {names}")
+        self._index = {name: i for i, name in enumerate(names)}
+
+        # (N, 4, 4) sensor-to-ego matrices, plus the split rotation/translation
+        # used by the vectorized transforms below.
+        self.extrinsics = pose_to_matrix([spec.pose_vector() for spec in self.sensors]) \
+            if self.sensors else np.zeros((0, 4, 4))
+        self._rotations = self.extrinsics[:, :3, :3]
+        self._translations = self.extrinsics[:, :3, 3]
+
+    @classmethod
+    def from_dict(cls, definition):
+        """Builds a rig from {'sensors': [{'name', 'type', 'pose', 'attributes', 'priority'}, ...]}"""
+        return cls(
+            SensorSpec(entry['name'], entry['type'], entry.get('pose'), entry.get('attributes'),
+                       entry.get('priority', 'normal'))
+            for entry in definition.get('sensors', [])
+        )
+
+    @classmethod
+    def from_file(cls, path):
+        """Loads a rig definition from a .yaml/.yml, .toml or .json file"""
+        extension = os.path.splitext(path)[1].lower()
+        if extension in ('.yaml', '.yml'):
+            import yaml
+            with open(path) as f:
+                definition = yaml.safe_load(f)
+        elif extension == '.toml':
+            try:
+                import tomllib
+            except ImportError:  # Python < 3.11
+                import tomli as tomllib
+            with open(path, 'rb') as f:
+                definition = tomllib.load(f)
+        elif extension == '.json':
+            with open(path) as f:
+                definition = json.load(f)
+        else:
+            raise ValueError(f"Unsupported rig file format: {path}")
+        return cls.from_dict(definition)
+
+    def __len__(self):
+        return len(self.sensors)
+
+    def __iter__(self):
+        return iter(self.sensors)
+
+    def __getitem__(self, name):
+        return self.sensors[self._index[name]]
+
+    def index(self, name):
+        return self._index[name]
+
+    def of_type(self, sensor_type):
+        """All specs of a given type ('camera', 'lidar', 'radar' or a blueprint id)"""
+        return [spec for spec in self.sensors
+                if spec.sensor_type == sensor_type or spec.blueprint_id == sensor_type]
+
+    def spawn(self, client, world, parent, registry=None):
+        """
+        Spawns every sensor of the rig attached to ``parent`` with one batch call.
+
+        With a utils.actor_registry.ActorRegistry, blueprints are tagged with the
+        sensor name as role and every spawned sensor is registered.
+
+        Returns:
+            dict: sensor name -> carla.Actor (None for sensors that failed to spawn).
+        """
+        blueprint_library = world.get_blueprint_library()
+        batch = []
+        for spec in self.sensors:
+            blueprint = spec.blueprint(blueprint_library)
+            if registry is not None:
+                registry.tag(blueprint, spec.name)
+            batch.append(carla.command.SpawnActor(blueprint, spec.transform(), parent))
+        responses = client.apply_batch_sync(batch, False)
+
+        actor_ids = [response.actor_id for response in responses if not response.error]
+        actors_by_id = {actor.id: actor for actor in world.get_actors(actor_ids)}
+
+        sensors = {}
+        for spec, response in zip(self.sensors, responses):
+            if response.error:
+                print(f"ERROR: {spec.name} ({spec.blueprint_id}) spawn failed: {response.error}")
+                sensors[spec.name] = None
+                continue
+            actor = actors_by_id.get(response.actor_id)
+            sensors[spec.name] = actor
+            if actor is not None and registry is not None:
+                registry.append(actor)
+        print(f"Rig spawned: {sum(actor is not None for actor in sensors.values())}/{len(self)} sensors")
+        return sensors
+
+    def to_ego(self, points, sensor_index, translate=True):
+        """
+        Moves points (or vectors) from their sensor frames into the ego frame.
+
+        Args:
+            points (np.ndarray): (M, >=3) array, only the first three columns are used.
+            sensor_index (np.ndarray | int): (M,) rig index of the sensor each row comes from,
+                or a single index for the whole array.
+            translate (bool): False for direction vectors such as velocities.
+
+        Returns:
+            np.ndarray: (M, 3) float64 coordinates in the ego frame.
+        """
+        xyz = np.asarray(points)[:, :3]
+        if np.ndim(sensor_index) == 0:
+            out = xyz @ self._rotations[sensor_index].T
+            if translate:
+                out += self._translations[sensor_index]
+            return out
+
+        out = np.einsum('mij,mj->mi', self._rotations[sensor_index], xyz)
+        if translate:
+            out += self._translations[sensor_index]
+        return out
+
+    def merge_to_ego(self, clouds):
+        """
+        Stacks per-sensor clouds and moves all of them into the ego frame at once.
+
+        Args:
+            clouds (dict): sensor name -> (Ni, >=3) array in that sensor's frame.
+
+        Returns:
+            tuple: ((M, 3) ego-frame points, (M,) rig index of the source sensor).
+        """
+        names = [name for name, cloud in clouds.items() if cloud is not None and len(cloud)]
+        if not names:
+            return np.zeros((0, 3)), np.zeros(0, dtype=np.intp)
+        stacked = np.concatenate([np.asarray(clouds[name])[:, :3] for name in names])
+        counts = [len(clouds[name]) for name in names]
+        sensor_index = np.repeat([self._index[name] for name in names], counts)
+        return self.to_ego(stacked, sensor_index), sensor_index
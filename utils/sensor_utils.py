@@ -1,6 +1,24 @@
 import numpy as np
 import math
 
+# Layout di un punto in SemanticLidarMeasurement.raw_data (carla.SemanticLidarDetection)
+SEMANTIC_LIDAR_DTYPE = np.dtype([
+    ('x', np.float32),
+    ('y', np.float32),
+    ('z', np.float32),
+    ('cos_inc_angle', np.float32),
+    ('object_idx', np.uint32),
+    ('object_tag', np.uint32),
+])
+
+# Tag semantici (CARLA >= 0.9.14) di superfici calpestabili, da non considerare ostacoli:
+# Roads, SideWalks, Terrain, RoadLine, Ground
+GROUND_TAGS = (1, 2, 10, 24, 25)
+
+# Tabella di lookup tag -> True se il punto va scartato (un solo accesso vettoriale per tutto il cloud)
+_GROUND_TAG_LUT = np.zeros(256, dtype=bool)
+_GROUND_TAG_LUT[list(GROUND_TAGS)] = True
+
 
 # In utils/sensor_utils.py
 
@@ -27,6 +45,7 @@ def lidar_callback(point_cloud, data_dict):
     # I dati sono una lista piatta di float [x1, y1, z1, i1, x2, y2, z2, i2, ...]
     points = np.frombuffer(point_cloud.raw_data, dtype=np.dtype('f4'))
     points = np.reshape(points, (int(points.shape[0] / 4), 4))
+    data_dict['points'] = points[:, :3]  # nuvola completa (frame del sensore) per la vista dall'alto
 
     # Filtra i punti per considerare solo quelli davanti al veicolo (asse X > 0)
     # e quelli sopra il livello della strada (asse Z > -2.0, per escludere il terreno)
@@ -45,6 +64,58 @@ def lidar_callback(point_cloud, data_dict):
         data_dict['distance'] = float('inf')
 
 
+def decode_semantic_lidar(raw_data):
+    """
+    Vista strutturata (senza copia) dei dati grezzi del LIDAR semantico.
+    """
+    return np.frombuffer(raw_data, dtype=SEMANTIC_LIDAR_DTYPE)
+
+
+def nearest_per_object(points, ignore_ids=()):
+    """
+    Distanza minima di ogni oggetto colpito, raggruppando i punti per object_idx (group-by vettoriale).
+
+    Args:
+        points (np.ndarray): array strutturato SEMANTIC_LIDAR_DTYPE.
+        ignore_ids (tuple): object_idx da escludere (es. l'id del veicolo ego).
+
+    Returns:
+        tuple: (object_idx unici, distanza minima di ciascuno), ordinati per object_idx.
+    """
+    if len(ignore_ids):
+        points = points[~np.isin(points['object_idx'], ignore_ids)]
+    if len(points) == 0:
+        return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.float32)
+
+    distances = np.sqrt(points['x'] ** 2 + points['y'] ** 2 + points['z'] ** 2)
+    order = np.argsort(points['object_idx'], kind='stable')
+    sorted_ids = points['object_idx'][order]
+    # Inizio di ogni gruppo di object_idx uguali nell'array ordinato
+    starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+    return sorted_ids[starts], np.minimum.reduceat(distances[order], starts)
+
+
+def semantic_lidar_callback(point_cloud, data_dict, ignore_ids=()):
+    """
+    Funzione di callback per il sensore LIDAR semantico.
+    Scarta strada/marciapiede/terreno usando i tag semantici (invece del filtro geometrico su z)
+    e calcola la distanza minima per ogni oggetto davanti al veicolo.
+    """
+    points = decode_semantic_lidar(point_cloud.raw_data)
+
+    # Un'unica lookup vettoriale sui tag + punti davanti al veicolo (asse X > 0)
+    not_ground = ~_GROUND_TAG_LUT.take(points['object_tag'], mode='clip')
+    obstacle = not_ground & (points['x'] > 0)
+    object_ids, distances = nearest_per_object(points[obstacle], ignore_ids)
+
+    # Solo i punti degli ostacoli (niente strada) per la vista dall'alto
+    kept = points[not_ground]
+    data_dict['points'] = np.stack((kept['x'], kept['y'], kept['z']), axis=1)
+
+    data_dict['objects'] = dict(zip(object_ids.tolist(), distances.tolist()))
+    data_dict['distance'] = float(distances.min()) if len(distances) else float('inf')
+
+
 def radar_callback(radar_data, data_dict, ego_vehicle):
     """
     Callback function for the radar sensor.
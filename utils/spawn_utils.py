@@ -1,20 +1,20 @@
-import sys
-from selectors import SelectSelector
-
-import carla
-import time
-import math
-import carla
 import random
 
+from utils.lazy import lazy_import
+
+carla = lazy_import('carla')
+
 
-def spawn_vehicle(world, model='vehicle.audi.tt'):
+def spawn_vehicle(world, model='vehicle.audi.tt', registry=None):
     """
     Cerca un punto di spawn libero e spawna un veicolo.
     Ritorna l'attore del veicolo o None se non ci sono punti liberi.
+    Con un ActorRegistry il veicolo viene taggato e registrato subito dopo lo spawn.
     """
     blueprint_library = world.get_blueprint_library()
     vehicle_bp = blueprint_library.filter(model)[0]
+    if registry is not None:
+        registry.tag(vehicle_bp, 'vehicle')
 
     spawn_points = world.get_map().get_spawn_points()
     spawn_point = random.choice(spawn_points)
@@ -22,6 +22,8 @@ def spawn_vehicle(world, model='vehicle.audi.tt'):
 
     if vehicle:
         print(f"Veicolo '{model}' spawnato con successo.")
+        if registry is not None:
+            registry.append(vehicle)
         vehicle.set_autopilot(False)
     else:
         print(
@@ -30,7 +32,8 @@ def spawn_vehicle(world, model='vehicle.audi.tt'):
     return vehicle
 
 
-def spawn_camera(world, vehicle, camera_transform: carla.Transform = None, img_width=800, img_height=600, fov=110):
+def spawn_camera(world, vehicle, camera_transform: 'carla.Transform' = None, img_width=800, img_height=600, fov=110,
+                 registry=None):
     """
     Crea un sensore fotocamera e lo attacca al veicolo in una posizione specifica.
 
@@ -42,6 +45,7 @@ def spawn_camera(world, vehicle, camera_transform: carla.Transform = None, img_w
         img_width (int, optional): Larghezza dell'immagine. Default a 800.
         img_height (int, optional): Altezza dell'immagine. Default a 600.
         fov (int, optional): Campo visivo in gradi. Default a 110.
+        registry (ActorRegistry, optional): Se fornito, la fotocamera viene taggata e registrata.
 
     Returns:
         carla.Actor: L'attore della fotocamera spawnata, o None se fallisce.
@@ -55,6 +59,8 @@ def spawn_camera(world, vehicle, camera_transform: carla.Transform = None, img_w
     camera_bp.set_attribute('image_size_y', f'{img_height}')
     camera_bp.set_attribute('fov', f'{fov}')
     camera_bp.set_attribute('sensor_tick', '0.0')  # 0.0 per il massimo frame rate possibile
+    if registry is not None:
+        registry.tag(camera_bp, 'camera')
 
     # Se non viene fornita una posizione, usiamo una posizione di default
     if camera_transform is None:
@@ -69,7 +75,54 @@ def spawn_camera(world, vehicle, camera_transform: carla.Transform = None, img_w
 
     if camera:
         print(f"Fotocamera spawnata con successo in posizione: {camera_transform.location}")
+        if registry is not None:
+            registry.append(camera)
     else:
         print("Impossibile spawnare la fotocamera.")
 
-    return camera
\ No newline at end of file
+    return camera
+
+
+def spawn_lidar(world, vehicle, lidar_transform: 'carla.Transform' = None, semantic=False, channels=32,
+                points_per_second=90000, rotation_frequency=10, sensor_range=20.0, registry=None):
+    """
+    Crea un sensore LIDAR (geometrico o semantico) e lo attacca al veicolo.
+
+    Args:
+        world (carla.World): Il mondo del simulatore.
+        vehicle (carla.Actor): Il veicolo a cui attaccare il LIDAR.
+        lidar_transform (carla.Transform, optional): Posizione rispetto al veicolo. Default: sul tetto.
+        semantic (bool, optional): Se True usa 'sensor.lidar.ray_cast_semantic', i cui punti hanno
+                                   object_idx e object_tag (vedi sensor_utils.semantic_lidar_callback).
+        channels (int, optional): Numero di canali. Default a 32.
+        points_per_second (int, optional): Punti al secondo. Default a 90000.
+        rotation_frequency (float, optional): Frequenza di rotazione in Hz. Default a 10.
+        sensor_range (float, optional): Portata massima in metri. Default a 20.
+        registry (ActorRegistry, optional): Se fornito, il LIDAR viene taggato e registrato.
+
+    Returns:
+        carla.Actor: L'attore del LIDAR spawnato, o None se fallisce.
+    """
+    blueprint_library = world.get_blueprint_library()
+    lidar_bp = blueprint_library.find('sensor.lidar.ray_cast_semantic' if semantic else 'sensor.lidar.ray_cast')
+
+    lidar_bp.set_attribute('channels', f'{channels}')
+    lidar_bp.set_attribute('points_per_second', f'{points_per_second}')
+    lidar_bp.set_attribute('rotation_frequency', f'{rotation_frequency}')
+    lidar_bp.set_attribute('range', f'{sensor_range}')
+    if registry is not None:
+        registry.tag(lidar_bp, 'lidar')
+
+    if lidar_transform is None:
+        lidar_transform = carla.Transform(carla.Location(z=2.5))  # Sul tetto del veicolo
+
+    lidar = world.spawn_actor(lidar_bp, lidar_transform, attach_to=vehicle)
+
+    if lidar:
+        print(f"LIDAR {'semantico ' if semantic else ''}spawnato con successo in posizione: {lidar_transform.location}")
+        if registry is not None:
+            registry.append(lidar)
+    else:
+        print("Impossibile spawnare il LIDAR.")
+
+    return lidar
@@ -0,0 +1,118 @@
+"""
+Background traffic driven by the Traffic Manager.
+
+N autopilot vehicles are spawned with one batch (SpawnActor + SetAutopilot on
+a dedicated Traffic Manager port). Hybrid physics keeps full vehicle dynamics
+only within ``hybrid_radius`` of the ego vehicle (the actor with role_name
+'hero'), the others are teleported along their path, so dense scenarios stay
+cheap to simulate. In synchronous mode the Traffic Manager is made
+synchronous too, so it advances exactly once per ``world.tick()``.
+
+    traffic = BackgroundTraffic(client, world, registry, tm_port=8000)
+    traffic.spawn(100)
+    ...
+    traffic.destroy()
+"""
+
+import random
+
+from utils.lazy import lazy_import
+
+carla = lazy_import('carla')
+
+
+class BackgroundTraffic:
+    """Autopilot vehicles on a dedicated Traffic Manager with hybrid physics"""
+
+    def __init__(self, client, world, registry, tm_port=8000, hybrid_physics=True, hybrid_radius=70.0,
+                 actor_active_distance=None, seed=None):
+        """
+        Args:
+            registry (utils.actor_registry.ActorRegistry): tags and tracks the spawned vehicles.
+            tm_port (int): Traffic Manager port, separate from other clients' managers.
+            hybrid_physics (bool): disable physics for vehicles far from the hero.
+            hybrid_radius (float): meters around the hero where vehicles keep full physics.
+            actor_active_distance (float): optional world setting (large maps only) beyond which
+                actors go dormant; destroy() puts the original value back.
+            seed (int): makes spawn points and Traffic Manager decisions reproducible.
+        """
+        self.client = client
+        self.world = world
+        self.registry = registry
+        self.tm_port = tm_port
+        self.vehicles = []
+        self._random = random.Random(seed)
+        self._original_active_distance = None
+
+        self.traffic_manager = client.get_trafficmanager(tm_port)
+        self.traffic_manager.set_hybrid_physics_mode(hybrid_physics)
+        if hybrid_physics:
+            self.traffic_manager.set_hybrid_physics_radius(hybrid_radius)
+        if seed is not None:
+            self.traffic_manager.set_random_device_seed(seed)
+
+        settings = world.get_settings()
+        self.synchronous = settings.synchronous_mode
+        # A synchronous world needs a synchronous Traffic Manager, or vehicles move between ticks
+        self.traffic_manager.set_synchronous_mode(self.synchronous)
+        if actor_active_distance is not None:
+            # The setting lives on the server: every later client would inherit it
+            self._original_active_distance = settings.actor_active_distance
+            settings.actor_active_distance = actor_active_distance
+            world.apply_settings(settings)
+
+    def _blueprints(self, blueprint_filter):
+        blueprints = [bp for bp in self.world.get_blueprint_library().filter(blueprint_filter)
+                      if not bp.has_attribute('number_of_wheels') or int(bp.get_attribute('number_of_wheels')) == 4]
+        if not blueprints:
+            raise ValueError(f"No 4-wheeled vehicle blueprints match '{blueprint_filter}'")
+        return blueprints
+
+    def spawn(self, count, blueprint_filter='vehicle.*', avoid=(), min_distance=10.0):
+        """
+        Spawns ``count`` autopilot vehicles in one batch.
+
+        Args:
+            avoid (list): carla.Location(s) to keep spawn points away from (e.g. ego and target).
+            min_distance (float): minimum distance in meters from every ``avoid`` location.
+
+        Returns:
+            list: the spawned vehicles (fewer than ``count`` if spawn points run out or collide).
+        """
+        spawn_points = [sp for sp in self.world.get_map().get_spawn_points()
+                        if all(sp.location.distance(location) >= min_distance for location in avoid)]
+        self._random.shuffle(spawn_points)
+        if count > len(spawn_points):
+            print(f"WARNING: {count} vehicles requested, only {len(spawn_points)} free spawn points")
+        blueprints = self._blueprints(blueprint_filter)
+
+        batch = []
+        for spawn_point in spawn_points[:count]:
+            blueprint = self.registry.tag(self._random.choice(blueprints), 'traffic')
+            if blueprint.has_attribute('color'):
+                blueprint.set_attribute('color', self._random.choice(blueprint.get_attribute('color').recommended_values))
+            batch.append(
+                carla.command.SpawnActor(blueprint, spawn_point)
+                .then(carla.command.SetAutopilot(carla.command.FutureActor, True, self.tm_port))
+            )
+
+        responses = self.client.apply_batch_sync(batch, self.synchronous)
+        actor_ids = [response.actor_id for response in responses if not response.error]
+        vehicles = list(self.world.get_actors(actor_ids))
+        for vehicle in vehicles:
+            self.registry.append(vehicle)
+        self.vehicles.extend(vehicles)
+
+        print(f"Background traffic: {len(vehicles)}/{len(batch)} vehicles spawned on TM port {self.tm_port}")
+        return vehicles
+
+    def destroy(self):
+        """Removes all background vehicles in one batch and restores the actor active distance"""
+        report = self.registry.destroy(self.vehicles)
+        self.vehicles = []
+        if self._original_active_distance is not None:
+            settings = self.world.get_settings()
+            settings.actor_active_distance = self._original_active_distance
+            self.world.apply_settings(settings)
+            self._original_active_distance = None
+        return report
@@ -0,0 +1,301 @@
+"""
+Decoupled real-time visualizer.
+
+Rendering runs in its own process (or thread) and receives data through
+shared-memory slots, so ``cv2.imshow``/``waitKey`` and video encoding never
+stall ``world.tick()`` or the control loop:
+
+    viz = Visualizer(cameras={'front': (600, 800, 3)}, lidar_points=100000, fps=15)
+    viz.start()
+    ...
+    viz.publish_camera('front', image)      # never blocks
+    viz.publish_radar(points, in_path, min_ttc)
+    if viz.should_close:                    # 'q' pressed in the window
+        break
+    ...
+    viz.close()
+
+Each slot keeps only the latest frame. Publishing while the renderer is
+reading drops the frame instead of waiting, and the renderer draws at its
+own configurable rate, skipping everything published in between. With
+``output='run.mp4'`` and ``headless=True`` frames are written offscreen to
+a video file and no window is opened.
+"""
+
+import ctypes
+import multiprocessing
+import threading
+import time
+
+import numpy as np
+
+from utils.lazy import lazy_import
+
+cv2 = lazy_import('cv2')
+
+BEV_SIZE = 600  # pixels, square bird's-eye view
+BEV_RANGE = 50.0  # meters shown ahead of the ego vehicle
+RADAR_FIELDS = 9  # utils.radar.POINT_FIELDS + in-path flag
+
+
+class SharedFrame:
+    """
+    Latest-value shared-memory slot for one array.
+
+    The first dimension may be variable (point clouds): ``rows`` holds the
+    number of valid rows and ``seq`` increments on every successful write.
+    """
+
+    def __init__(self, shape, dtype, ctx=multiprocessing):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self._buffer = ctx.RawArray(ctypes.c_uint8, nbytes)
+        self._lock = ctx.Lock()
+        self.seq = ctx.RawValue(ctypes.c_uint64, 0)
+        self.rows = ctx.RawValue(ctypes.c_uint64, 0)
+        self.dropped = ctx.RawValue(ctypes.c_uint64, 0)
+
+    def _array(self):
+        return np.frombuffer(self._buffer, dtype=self.dtype).reshape(self.shape)
+
+    def write(self, array):
+        """Copies ``array`` into the slot; returns False (frame dropped) if the reader holds it"""
+        if not self._lock.acquire(False):
+            self.dropped.value += 1
+            return False
+        try:
+            rows = min(len(array), self.shape[0])
+            np.copyto(self._array()[:rows], array[:rows], casting='unsafe')
+            self.rows.value = rows
+            self.seq.value += 1
+        finally:
+            self._lock.release()
+        return True
+
+    def read(self, last_seq):
+        """Returns (seq, copy of the valid rows) or (last_seq, None) if nothing new"""
+        if self.seq.value == last_seq:
+            return last_seq, None
+        with self._lock:
+            return self.seq.value, self._array()[:self.rows.value].copy()
+
+
+class Visualizer:
+    """Camera mosaic + LiDAR/radar bird's-eye view rendered off the control loop"""
+
+    def __init__(self, cameras=None, lidar_points=0, radar_points=0, fps=15.0,
+                 output=None, headless=False, tile_width=400, window='SVS-LAB', mode='process'):
+        """
+        Args:
+            cameras (dict): camera name -> (height, width, channels) of the published frames.
+            lidar_points (int): max LiDAR points per frame (0 disables the LiDAR layer).
+            radar_points (int): max radar points per sweep (0 disables the radar layer).
+            fps (float): render rate, independent of the simulation rate.
+            output (str): optional video file (e.g. 'run.mp4') the rendered frames are written to.
+            headless (bool): render offscreen only, without opening a window.
+            tile_width (int): width of each camera tile in the mosaic.
+            mode (str): 'process' (default) or 'thread'.
+        """
+        if mode not in ('process', 'thread'):
+            raise ValueError(f"Unknown visualizer mode: {mode}")
+        ctx = multiprocessing.get_context('spawn')
+
+        self.camera_slots = {name: SharedFrame(shape, np.uint8, ctx) for name, shape in (cameras or {}).items()}
+        self.lidar_slot = SharedFrame((lidar_points, 3), np.float32, ctx) if lidar_points else None
+        self.radar_slot = SharedFrame((radar_points, RADAR_FIELDS), np.float32, ctx) if radar_points else None
+        self.min_ttc = ctx.RawValue(ctypes.c_double, float('inf'))
+        self.rendered = ctx.RawValue(ctypes.c_uint64, 0)
+        self._stop = ctx.Event()
+        self._closed_by_user = ctx.Event()
+
+        self.options = {
+            'fps': fps,
+            'output': output,
+            'headless': headless,
+            'tile_width': tile_width,
+            'window': window,
+        }
+        args = (self.camera_slots, self.lidar_slot, self.radar_slot, self.min_ttc,
+                self.rendered, self._stop, self._closed_by_user, self.options)
+        if mode == 'process':
+            self._worker = ctx.Process(target=_render_loop, args=args, daemon=True)
+        else:
+            self._worker = threading.Thread(target=_render_loop, args=args, daemon=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        self._worker.start()
+        return self
+
+    def close(self, timeout=2.0):
+        """Stops the renderer and flushes the video file"""
+        self._stop.set()
+        if self._worker.is_alive():
+            self._worker.join(timeout)
+
+    @property
+    def should_close(self):
+        """True once the user pressed 'q' in the window"""
+        return self._closed_by_user.is_set()
+
+    def publish_camera(self, name, image):
+        slot = self.camera_slots[name]
+        if image.shape[:2] != slot.shape[:2]:
+            # The sensor governor may have lowered the camera resolution
+            image = cv2.resize(np.ascontiguousarray(image), (slot.shape[1], slot.shape[0]),
+                               interpolation=cv2.INTER_NEAREST)
+        return slot.write(image)
+
+    def publish_lidar(self, points):
+        """Publishes an (N, >=3) sensor- or ego-frame point cloud"""
+        if self.lidar_slot is None:
+            return False
+        return self.lidar_slot.write(np.asarray(points)[:, :3])
+
+    def publish_radar(self, points, in_path, min_ttc):
+        """Publishes ego-frame radar points (utils.radar layout), their in-path mask and the TTC"""
+        self.min_ttc.value = min_ttc
+        if self.radar_slot is None:
+            return False
+        packed = np.empty((len(points), RADAR_FIELDS), dtype=np.float32)
+        packed[:, :-1] = points
+        packed[:, -1] = in_path
+        return self.radar_slot.write(packed)
+
+    def stats(self):
+        """Rendered frames and frames dropped at publish time, per slot"""
+        dropped = {name: slot.dropped.value for name, slot in self.camera_slots.items()}
+        if self.lidar_slot is not None:
+            dropped['lidar'] = self.lidar_slot.dropped.value
+        if self.radar_slot is not None:
+            dropped['radar'] = self.radar_slot.dropped.value
+        return {'rendered': self.rendered.value, 'dropped': dropped}
+
+
+def camera_mosaic(frames, tile_width):
+    """Tiles camera frames (dict name -> image) in a grid of equally sized tiles"""
+    tiles = []
+    for name, frame in frames.items():
+        height, width = frame.shape[:2]
+        tile = cv2.resize(frame, (tile_width, int(height * tile_width / width)), interpolation=cv2.INTER_AREA)
+        cv2.putText(tile, name, (8, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+        tiles.append(np.ascontiguousarray(tile[:, :, :3]))
+    if not tiles:
+        return None
+
+    columns = int(np.ceil(np.sqrt(len(tiles))))
+    tile_height = max(tile.shape[0] for tile in tiles)
+    rows = int(np.ceil(len(tiles) / columns))
+    mosaic = np.zeros((rows * tile_height, columns * tile_width, 3), dtype=np.uint8)
+    for i, tile in enumerate(tiles):
+        r, c = divmod(i, columns)
+        mosaic[r * tile_height:r * tile_height + tile.shape[0], c * tile_width:(c + 1) * tile_width] = tile
+    return mosaic
+
+
+def _to_pixels(points, size=BEV_SIZE, meters=BEV_RANGE):
+    """Ego-frame x (forward) / y (right) to BEV pixel rows/cols, ego at the bottom centre"""
+    scale = size / meters
+    rows = (size - 1 - points[:, 0] * scale).astype(np.int32)
+    cols = (size / 2 + points[:, 1] * scale).astype(np.int32)
+    inside = (rows >= 0) & (rows < size) & (cols >= 0) & (cols < size)
+    return rows[inside], cols[inside], inside
+
+
+def birds_eye_view(lidar, radar_points, min_ttc):
+    """LiDAR points in grey, radar returns in yellow (red when in-path), TTC overlay"""
+    bev = np.zeros((BEV_SIZE, BEV_SIZE, 3), dtype=np.uint8)
+    if lidar is not None and len(lidar):
+        rows, cols, _ = _to_pixels(lidar)
+        bev[rows, cols] = (160, 160, 160)
+
+    if radar_points is not None and len(radar_points):
+        rows, cols, inside = _to_pixels(radar_points)
+        in_path = radar_points[inside, -1] > 0.5
+        colors = np.where(in_path[:, None], (0, 0, 255), (0, 220, 255)).astype(np.uint8)
+        # 3x3 markers, drawn with vectorized offsets instead of per-point cv2.circle
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                bev[np.clip(rows + dr, 0, BEV_SIZE - 1), np.clip(cols + dc, 0, BEV_SIZE - 1)] = colors
+
+    cv2.rectangle(bev, (BEV_SIZE // 2 - 5, BEV_SIZE - 12), (BEV_SIZE // 2 + 5, BEV_SIZE - 1), (0, 255, 0), -1)
+    ttc_text = f"TTC: {min_ttc:.2f}s" if np.isfinite(min_ttc) else "TTC: inf"
+    cv2.putText(bev, ttc_text, (10, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    return bev
+
+
+def compose(mosaic, bev):
+    """Places the mosaic and the bird's-eye view side by side"""
+    panels = [panel for panel in (mosaic, bev) if panel is not None]
+    if not panels:
+        return None
+    height = max(panel.shape[0] for panel in panels)
+    padded = [np.pad(panel, ((0, height - panel.shape[0]), (0, 0), (0, 0))) for panel in panels]
+    return np.hstack(padded)
+
+
+def _render_loop(camera_slots, lidar_slot, radar_slot, min_ttc, rendered, stop, closed_by_user, options):
+    """Renderer main loop: runs in the visualizer process/thread at options['fps']"""
+    period = 1.0 / options['fps']
+    show_window = not options['headless']
+    writer = None
+
+    seqs = {name: 0 for name in camera_slots}
+    # Black tiles until the first frame arrives, so the canvas (and video) size never changes.
+    frames = {name: np.zeros(slot.shape, dtype=np.uint8) for name, slot in camera_slots.items()}
+    lidar_seq = radar_seq = 0
+    lidar = radar_points = None
+    draw_bev = lidar_slot is not None or radar_slot is not None
+
+    next_frame = time.perf_counter()
+    try:
+        while not stop.is_set():
+            # Only the latest published data is read: everything in between is dropped.
+            for name, slot in camera_slots.items():
+                seqs[name], frame = slot.read(seqs[name])
+                if frame is not None:
+                    frames[name] = frame
+            if lidar_slot is not None:
+                lidar_seq, points = lidar_slot.read(lidar_seq)
+                lidar = points if points is not None else lidar
+            if radar_slot is not None:
+                radar_seq, points = radar_slot.read(radar_seq)
+                radar_points = points if points is not None else radar_points
+
+            bev = birds_eye_view(lidar, radar_points, min_ttc.value) if draw_bev else None
+            canvas = compose(camera_mosaic(frames, options['tile_width']), bev)
+
+            if canvas is not None:
+                if options['output']:
+                    if writer is None:
+                        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+                        writer = cv2.VideoWriter(options['output'], fourcc, options['fps'],
+                                                 (canvas.shape[1], canvas.shape[0]))
+                    writer.write(canvas)
+                if show_window:
+                    cv2.imshow(options['window'], canvas)
+                rendered.value += 1
+
+            if show_window and cv2.waitKey(1) == ord('q'):
+                closed_by_user.set()
+                break
+
+            next_frame += period
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Renderer is late: skip the missed slots instead of catching up.
+                next_frame = time.perf_counter()
+    finally:
+        if writer is not None:
+            writer.release()
+        if show_window:
+            cv2.destroyAllWindows()